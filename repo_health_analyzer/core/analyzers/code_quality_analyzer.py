@@ -4,15 +4,71 @@ import re
 import os
 import math
 from pathlib import Path
-from typing import List, Dict, Any, Set, Tuple
+from typing import List, Dict, Any, Set, Tuple, NamedTuple, Optional
 from collections import defaultdict, Counter
+
+import numpy as np
+
 from ...models.simple_report import CodeQualityMetrics, AnalysisConfig
 
+# Upper bounds (inclusive) of the complexity buckets; anything above the last
+# bound falls into the final bucket.
+_COMPLEXITY_BINS = np.array([3, 6, 10, 15], dtype=np.int32)
+_COMPLEXITY_LABELS = ('simple', 'moderate', 'complex', 'very_complex', 'extremely_complex')
+
+# File extension -> language family
+_EXT_MAP: Dict[str, str] = {
+    '.py': 'python',
+    '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
+    '.java': 'java',
+    '.c': 'c', '.cpp': 'c', '.cc': 'c', '.cxx': 'c',
+    '.cs': 'csharp',
+    '.php': 'php',
+    '.rb': 'ruby',
+    '.go': 'go',
+    '.rs': 'rust'
+}
+
+# all_metrics series that receive exactly one value per analyzed file,
+# paired with the FileMetrics field that feeds them
+_PER_FILE_SERIES = (
+    ('comment_ratios', 'comment_ratio'),
+    ('naming_scores', 'naming_score'),
+    ('duplication_scores', 'duplication_score'),
+    ('smell_counts', 'smell_count'),
+    ('type_hint_ratios', 'type_hint_ratio'),
+    ('error_handling_ratios', 'error_handling_ratio'),
+    ('line_violations', 'line_violations'),
+)
+
+
+class FileMetrics(NamedTuple):
+    """Per-file analysis results (a tuple keeps per-file overhead low)."""
+    file_path: str
+    language: str
+    total_lines: int
+    complexity: List[int]
+    function_lengths: List[int]
+    comment_ratio: float = 0.0
+    naming_score: float = 0.0
+    duplication_score: float = 0.0
+    smell_count: int = 0
+    type_hint_ratio: float = 0.0
+    error_handling_ratio: float = 0.0
+    line_violations: int = 0
+    indentation_consistency: float = 1.0
+    todo_count: int = 0
+
+
 class CodeQualityAnalyzer:
     def __init__(self, config: AnalysisConfig):
         self.config = config
         self.language_patterns = self._initialize_language_patterns()
         self.code_smells = self._initialize_code_smells()
+        self._todo_re = re.compile(r'\bTODO\b', re.IGNORECASE)
+        self._pattern_for_ext = {
+            ext: self.language_patterns.get(lang, {}) for ext, lang in _EXT_MAP.items()
+        }
         
     def _initialize_language_patterns(self) -> Dict[str, Dict[str, Any]]:
         """Initialize language-specific patterns for analysis."""
@@ -79,15 +135,14 @@ class CodeQualityAnalyzer:
         """Perform comprehensive code quality analysis without AST."""
         print(f"🔧 Advanced regex-based code quality analysis on {len(source_files)} files...")
         
-        # Initialize metrics collectors
-        all_metrics: Dict[str, List[float]] = {
-            'complexity': [], 'function_lengths': [], 'comment_ratios': [], 
-            'naming_scores': [], 'duplication_scores': [], 'smell_counts': [],
-            'type_hint_ratios': [], 'error_handling_ratios': [], 'line_violations': []
-        }
+        # Initialize metrics collectors; per-file series are pre-sized and
+        # trimmed to the number of analyzed files afterwards
+        all_metrics: Dict[str, List[float]] = {'complexity': [], 'function_lengths': []}
+        for series, _ in _PER_FILE_SERIES:
+            all_metrics[series] = [0.0] * len(source_files)
         
-        complexity_distribution: Dict[str, int] = defaultdict(int)
         file_analysis_details = []
+        analyzed_count = 0
         total_lines = 0
         total_functions = 0
         
@@ -105,33 +160,27 @@ class CodeQualityAnalyzer:
                 file_metrics = self._analyze_file_comprehensive(file_path)
                 if file_metrics:
                     # Collect complexity metrics
-                    if file_metrics['complexity']:
-                        all_metrics['complexity'].extend(file_metrics['complexity'])
-                        for complexity in file_metrics['complexity']:
-                            if complexity <= 3: complexity_distribution['simple'] += 1
-                            elif complexity <= 6: complexity_distribution['moderate'] += 1
-                            elif complexity <= 10: complexity_distribution['complex'] += 1
-                            elif complexity <= 15: complexity_distribution['very_complex'] += 1
-                            else: complexity_distribution['extremely_complex'] += 1
+                    all_metrics['complexity'].extend(file_metrics.complexity)
                     
                     # Collect other metrics
-                    all_metrics['function_lengths'].extend(file_metrics['function_lengths'])
-                    all_metrics['comment_ratios'].append(file_metrics['comment_ratio'])
-                    all_metrics['naming_scores'].append(file_metrics['naming_score'])
-                    all_metrics['duplication_scores'].append(file_metrics['duplication_score'])
-                    all_metrics['smell_counts'].append(file_metrics['smell_count'])
-                    all_metrics['type_hint_ratios'].append(file_metrics['type_hint_ratio'])
-                    all_metrics['error_handling_ratios'].append(file_metrics['error_handling_ratio'])
-                    all_metrics['line_violations'].append(file_metrics['line_violations'])
+                    all_metrics['function_lengths'].extend(file_metrics.function_lengths)
+                    for series, field_name in _PER_FILE_SERIES:
+                        all_metrics[series][analyzed_count] = getattr(file_metrics, field_name)
+                    analyzed_count += 1
                     
-                    total_lines += file_metrics['total_lines']
-                    total_functions += len(file_metrics['function_lengths'])
+                    total_lines += file_metrics.total_lines
+                    total_functions += len(file_metrics.function_lengths)
                     file_analysis_details.append(file_metrics)
                     
             except Exception as e:
                 print(f"  ⚠️  Error analyzing {file_path.name}: {str(e)[:50]}...")
                 continue
         
+        for series, _ in _PER_FILE_SERIES:
+            del all_metrics[series][analyzed_count:]
+        
+        complexity_distribution = self._bin_complexity_distribution(all_metrics['complexity'])
+        
         # Calculate comprehensive scores
         metrics_summary = self._calculate_comprehensive_scores(all_metrics, total_lines, total_functions)
         
@@ -155,7 +204,7 @@ class CodeQualityAnalyzer:
             comment_density=round(metrics_summary['avg_comment_density'], 3),
             naming_consistency=round(metrics_summary['avg_naming_score'], 3),
             duplication_ratio=round(metrics_summary['avg_duplication'], 3),
-            complexity_distribution=dict(complexity_distribution),
+            complexity_distribution=complexity_distribution,
             craftsmanship_score=round(metrics_summary['craftsmanship_score'], 1),
             type_hint_coverage=round(metrics_summary['avg_type_hints'], 3),
             error_handling_density=round(metrics_summary['avg_error_handling'], 3),
@@ -164,58 +213,57 @@ class CodeQualityAnalyzer:
             indentation_consistency=round(metrics_summary['indentation_score'], 3)
         )
     
-    def _analyze_file_comprehensive(self, file_path: Path) -> Dict[str, Any]:
+    def _bin_complexity_distribution(self, complexities: List[float]) -> Dict[str, int]:
+        """Bucket function complexities into the distribution buckets in one vectorized pass."""
+        if not complexities:
+            return {}
+        
+        values = np.asarray(complexities, dtype=np.int32)
+        bucket_indices = np.digitize(values, _COMPLEXITY_BINS, right=True)
+        counts = np.bincount(bucket_indices, minlength=len(_COMPLEXITY_LABELS))
+        return {label: int(count) for label, count in zip(_COMPLEXITY_LABELS, counts) if count}
+    
+    def _analyze_file_comprehensive(self, file_path: Path) -> Optional[FileMetrics]:
         """Comprehensive file analysis using regex patterns."""
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
         except Exception:
-            return {}
+            return None
         
         if not content.strip():
-            return {}
+            return None
             
         lines = content.split('\n')
         file_extension = file_path.suffix.lower()
         
         # Determine language and get patterns
         language = self._detect_language(file_extension)
-        patterns = self.language_patterns.get(language, {})
+        patterns = self._pattern_for_ext.get(file_extension, {})
         
         # OPTIMIZED real analysis - fast but accurate
-        analysis_results = {
-            'file_path': str(file_path),
-            'language': language,
-            'total_lines': len([line for line in lines if line.strip()]),
-            'complexity': self._calculate_complexity_fast(content, patterns),
-            'function_lengths': self._calculate_function_lengths_fast(content, patterns),
-            'comment_ratio': self._calculate_comment_ratio_fast(lines, patterns),
-            'naming_score': self._analyze_naming_fast(content, patterns),
-            'duplication_score': self._detect_duplication_fast(content),
-            'smell_count': self._count_smells_fast(content),
-            'type_hint_ratio': self._calculate_type_hints_fast(content, language),
-            'error_handling_ratio': self._calculate_error_handling_fast(content, patterns),
-            'line_violations': self._check_line_violations_fast(lines),
-            'indentation_consistency': self._calculate_indentation_fast(lines),
-            'todo_count': content.upper().count('TODO')
-        }
+        analysis_results = FileMetrics(
+            file_path=str(file_path),
+            language=language,
+            total_lines=len([line for line in lines if line.strip()]),
+            complexity=self._calculate_complexity_fast(content, patterns),
+            function_lengths=self._calculate_function_lengths_fast(content, patterns),
+            comment_ratio=self._calculate_comment_ratio_fast(lines, patterns),
+            naming_score=self._analyze_naming_fast(content, patterns),
+            duplication_score=self._detect_duplication_fast(content),
+            smell_count=self._count_smells_fast(content),
+            type_hint_ratio=self._calculate_type_hints_fast(content, language),
+            error_handling_ratio=self._calculate_error_handling_fast(content, patterns),
+            line_violations=self._check_line_violations_fast(lines),
+            indentation_consistency=self._calculate_indentation_fast(lines),
+            todo_count=len(self._todo_re.findall(content))
+        )
         
         return analysis_results
     
     def _detect_language(self, file_extension: str) -> str:
         """Detect programming language from file extension."""
-        extension_map = {
-            '.py': 'python',
-            '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
-            '.java': 'java',
-            '.c': 'c', '.cpp': 'c', '.cc': 'c', '.cxx': 'c',
-            '.cs': 'csharp',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.go': 'go',
-            '.rs': 'rust'
-        }
-        return extension_map.get(file_extension, 'generic')
+        return _EXT_MAP.get(file_extension, 'generic')
     
     # FAST but REAL analysis methods
     def _calculate_complexity_fast(self, content: str, patterns: Dict) -> List[int]:
@@ -670,7 +718,7 @@ class CodeQualityAnalyzer:
         craftsmanship_score = (naming_score + comment_score + duplication_score) / 3
         
         # TODO density
-        todo_counts = [m.get('todo_count', 0) for m in all_metrics.get('file_details', [])]
+        todo_counts = [m.todo_count for m in all_metrics.get('file_details', [])]
         todo_density = sum(todo_counts) / max(total_lines, 1) if total_lines > 0 else 0
         
         return {
@@ -689,7 +737,7 @@ class CodeQualityAnalyzer:
             'indentation_score': indentation_score
         }
     
-    def _generate_quality_insights(self, file_details: List[Dict], metrics_summary: Dict) -> Dict[str, Any]:
+    def _generate_quality_insights(self, file_details: List[FileMetrics], metrics_summary: Dict) -> Dict[str, Any]:
         """Generate insights and recommendations."""
         insights: Dict[str, Any] = {
             'top_issues': [],
@@ -699,8 +747,8 @@ class CodeQualityAnalyzer:
         }
         
         # Identify complexity hotspots
-        complex_files = [f for f in file_details if f.get('complexity') and max(f['complexity']) > 15]
-        insights['complexity_hotspots'] = [f['file_path'] for f in complex_files[:5]]
+        complex_files = [f for f in file_details if f.complexity and max(f.complexity) > 15]
+        insights['complexity_hotspots'] = [f.file_path for f in complex_files[:5]]
         
         # Generate recommendations based on scores
         if metrics_summary['avg_complexity'] > 8:
@@ -1,149 +1,272 @@
 """Advanced code smell analyzer using regex patterns and heuristic analysis."""
 
 import re
+import heapq
 import math
+import mmap
+import os
+from bisect import bisect_right
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Set, Tuple, Any
+from typing import List, Dict, Set, Tuple, Any, NamedTuple, Optional, Union
 from collections import defaultdict, Counter
+import numpy as np
 from ...models.simple_report import CodeSmellMetrics, AnalysisConfig
+from .parallel import map_files
+
+# File extension -> language family
+_EXT_MAP: Dict[str, str] = {
+    '.py': 'python',
+    '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
+    '.java': 'java',
+    '.c': 'c', '.cpp': 'c', '.cc': 'c', '.cxx': 'c',
+    '.cs': 'csharp',
+    '.php': 'php',
+    '.rb': 'ruby',
+    '.go': 'go',
+    '.rs': 'rust'
+}
+
+# First bytes of a line that may still be blank to str.strip(): ASCII whitespace
+# other than the space and tab that mark an indented line, and any non-ASCII byte
+_MAYBE_BLANK_FIRST_BYTES = np.zeros(256, dtype=bool)
+_MAYBE_BLANK_FIRST_BYTES[list(b'\x0b\x0c\x1c\x1d\x1e\x1f')] = True
+_MAYBE_BLANK_FIRST_BYTES[0x80:] = True
+
+# Number of smells the fast path reports per file
+_FAST_SMELLS_PER_FILE = 10
+
+# Number of individual smells kept in the report
+_REPORTED_SMELLS = 50
+
+
+class Smell(NamedTuple):
+    """A single code smell found in a file."""
+    type: str
+    severity: str
+    file: str
+    line: int
+    description: str
+    context: str = ''
+    suggestion: str = ''
+
 
 class CodeSmellAnalyzer:
+    # Token-level smells scanned together in a single alternation pass. In a fused
+    # regex one match consumes the text the others would have matched, so only
+    # patterns whose matches can never overlap are fused: a magic number cannot
+    # start inside a private access (every position there follows a word character
+    # or '._'), nor one inside a digit run. feature_envy, message_chains and
+    # data_clumps can contain either, so they keep their own pass.
+    _FUSED_SMELLS = ('inappropriate_intimacy', 'magic_numbers')
+    
     def __init__(self, config: AnalysisConfig):
         self.config = config
         self.smell_patterns = self._initialize_smell_patterns()
+        self._marker_literals = frozenset(
+            literal for smell_config in self.smell_patterns.values()
+            for literal in smell_config['required_literals']
+        )
         self.language_patterns = self._initialize_language_patterns()
         self.severity_weights = self._initialize_severity_weights()
+        # Severity -> slot in the weight vector; the last slot weighs unknown severities
+        self._severity_index = {severity: i for i, severity in enumerate(self.severity_weights)}
+        self._severity_weight_vector = np.array(
+            list(self.severity_weights.values()) + [1.0], dtype=np.float64
+        )
+        self._newline_re = re.compile('\n')
+        # Every fused smell starts with a word character; the leading lookahead
+        # rejects all other positions before any alternative is tried
+        self._fused_pattern = re.compile(
+            r'(?=\w)(?:' + '|'.join(
+                f"(?P<{smell_type}>{self.smell_patterns[smell_type]['pattern']})"
+                for smell_type in self._FUSED_SMELLS
+            ) + ')',
+            re.MULTILINE | re.DOTALL
+        )
+        # The fast path scans pure ASCII files as memory-mapped bytes, where bytes
+        # patterns match as str patterns would; other files are decoded first
+        self._compiled_fast = {
+            'non_ascii': re.compile(rb'[^\x00-\x7f]'),
+            'non_whitespace': re.compile(rb'[^\s\x1c-\x1f]'),
+            'def_keyword': re.compile(rb'def '),
+            'parameter_list': re.compile(rb'def\s+\w+\(([^)]*)\)'),
+            'magic_number': re.compile(rb'\b\d{2,}\b'),
+            'text_parameter_list': re.compile(r'def\s+\w+\(([^)]*)\)'),
+            'text_magic_number': re.compile(r'\b\d{2,}\b'),
+            'validation_block': re.compile(
+                r'if .{5,} <= 0:\s*raise ValueError\(["\'][^"\']*["\']?\)', re.MULTILINE
+            ),
+            'method_block': re.compile(r'def \w+\([^)]*\):\s*if', re.MULTILINE),
+        }
         
     def _initialize_smell_patterns(self) -> Dict[str, Dict[str, Any]]:
-        """Initialize comprehensive code smell patterns."""
-        return {
+        """Initialize comprehensive code smell patterns.
+        
+        Each pattern is compiled once here and stored under ``'compiled'``.
+        ``'required_literals'`` lists substrings of which at least one must be
+        present for the pattern to match at all; an empty tuple disables the check.
+        """
+        smell_patterns = {
             'long_method': {
                 'pattern': r'def\s+\w+.*?(?=def|\Z)',
+                'required_literals': ('def',),
                 'threshold': 50,  # lines
                 'severity': 'medium',
                 'description': 'Method is too long and complex'
             },
             'long_parameter_list': {
                 'pattern': r'def\s+\w+\s*\(([^)]*)\)',
+                'required_literals': ('def',),
                 'threshold': 5,  # parameters
                 'severity': 'medium',
                 'description': 'Too many parameters in method signature'
             },
             'duplicate_code': {
-                'pattern': r'(.{40,})\n(?:.*\n){0,3}\1',
+                'pattern': None,  # detected by _find_duplicate_blocks/_find_duplicate_blocks_rk
+                'required_literals': (),
                 'threshold': 3,  # occurrences
                 'severity': 'critical',
                 'description': 'Duplicated code blocks detected'
             },
             'large_class': {
                 'pattern': r'class\s+(\w+).*?(?=class|\Z)',
+                'required_literals': ('class',),
                 'threshold': 20,  # lines (reduced for testing)
                 'severity': 'high',
                 'description': 'Class is too large (God Class anti-pattern)'
             },
             'feature_envy': {
                 'pattern': r'self\.(\w+)\.(\w+)\.(\w+)',
+                'required_literals': ('self.',),
                 'threshold': 3,  # chain length
                 'severity': 'medium',
                 'description': 'Method uses more features of another class than its own'
             },
             'data_clumps': {
                 'pattern': r'def\s+\w+\s*\([^)]*(\w+)\s*,\s*(\w+)\s*,\s*(\w+)\s*,\s*(\w+)',
+                'required_literals': ('def',),
                 'threshold': 4,  # parameters
                 'severity': 'medium',
                 'description': 'Groups of data that appear together repeatedly'
             },
             'primitive_obsession': {
                 'pattern': r':\s*(str|int|float|bool)\s*,.*:\s*(str|int|float|bool)\s*,.*:\s*(str|int|float|bool)',
+                'required_literals': ('str', 'int', 'float', 'bool'),
                 'threshold': 3,  # consecutive primitives
                 'severity': 'low',
                 'description': 'Overuse of primitive types instead of objects'
             },
             'switch_statements': {
                 'pattern': r'if\s+\w+\s*==.*?elif\s+\w+\s*==.*?elif\s+\w+\s*==',
+                'required_literals': ('elif',),
                 'threshold': 3,  # elif chains
                 'severity': 'medium',
                 'description': 'Long if-elif chains should be replaced with polymorphism'
             },
             'temporary_field': {
                 'pattern': r'self\.\w+\s*=\s*None.*?self\.\w+\s*=\s*\w+',
+                'required_literals': ('None',),
                 'threshold': 1,
                 'severity': 'low',
                 'description': 'Fields that are set only in certain circumstances'
             },
             'refused_bequest': {
                 'pattern': r'raise\s+NotImplementedError|pass\s*#.*not\s+implemented',
+                'required_literals': ('NotImplementedError', 'not'),
                 'threshold': 1,
                 'severity': 'medium',
                 'description': 'Subclass refuses to support parent class interface'
             },
             'inappropriate_intimacy': {
-                'pattern': r'(\w+)\._(\w+)',
+                # Anchored at a word start: a match can never begin mid-identifier,
+                # and this avoids rescanning every suffix of each identifier
+                'pattern': r'(?<!\w)(\w+)\._(\w+)',
+                'required_literals': ('._',),
                 'threshold': 3,  # private access count
                 'severity': 'medium',
                 'description': 'Classes know too much about each other\'s private details'
             },
             'message_chains': {
                 'pattern': r'\.(\w+)\.(\w+)\.(\w+)\.(\w+)',
+                'required_literals': (),
                 'threshold': 4,  # chain length
                 'severity': 'medium',
                 'description': 'Long chains of method calls violate Law of Demeter'
             },
             'middle_man': {
                 'pattern': r'def\s+(\w+).*?return\s+self\.\w+\.\1\(',
+                'required_literals': ('return',),
                 'threshold': 3,  # delegation count
                 'severity': 'low',
                 'description': 'Class does nothing but delegate to another class'
             },
             'speculative_generality': {
                 'pattern': r'class\s+Abstract\w+|class\s+Base\w+.*?pass',
+                'required_literals': ('Abstract', 'Base'),
                 'threshold': 1,
                 'severity': 'low',
                 'description': 'Unused abstract classes or interfaces'
             },
             'dead_code': {
                 'pattern': r'#.*TODO.*REMOVE|#.*DEPRECATED|#.*UNUSED|def\s+\w+.*?pass\s*$',
+                'required_literals': ('REMOVE', 'DEPRECATED', 'UNUSED', 'pass'),
                 'threshold': 1,
                 'severity': 'high',
                 'description': 'Code that is never executed or explicitly marked for removal'
             },
             'magic_numbers': {
                 'pattern': r'(?<!\w)(\d{2,})(?!\w|\.|\d)',
+                'required_literals': (),
                 'threshold': 5,  # occurrences
                 'severity': 'low',
                 'description': 'Hardcoded numeric literals should be named constants'
             },
             'magic_strings': {
                 'pattern': r'["\']([^"\']{15,})["\']',
+                'required_literals': ('"', "'"),
                 'threshold': 3,  # occurrences
                 'severity': 'low',
                 'description': 'Long hardcoded string literals should be constants'
             },
             'shotgun_surgery': {
                 'pattern': r'import\s+(\w+).*?from\s+\1\s+import',
+                'required_literals': ('from',),
                 'threshold': 5,  # related changes
                 'severity': 'high',
                 'description': 'Making changes requires modifications in many classes'
             },
             'divergent_change': {
                 'pattern': r'class\s+\w+.*?def\s+\w+.*?def\s+\w+.*?def\s+\w+.*?def\s+\w+',
+                'required_literals': ('class',),
                 'threshold': 10,  # methods in class
                 'severity': 'medium',
                 'description': 'Class is changed for multiple different reasons'
             },
             'lazy_class': {
                 'pattern': r'class\s+(\w+).*?def\s+__init__.*?(?=class|\Z)',
+                'required_literals': ('__init__',),
                 'threshold': 20,  # minimum lines for useful class
                 'severity': 'low',
                 'description': 'Class doesn\'t do enough to justify its existence'
             },
             'comments': {
                 'pattern': r'#.*TODO|#.*FIXME|#.*HACK|#.*BUG|#.*WARNING',
+                'required_literals': ('TODO', 'FIXME', 'HACK', 'BUG', 'WARNING'),
                 'threshold': 1,
                 'severity': 'low',
                 'description': 'Code comments indicating technical debt'
             }
         }
+        
+        for smell_config in smell_patterns.values():
+            if smell_config['pattern'] is not None:
+                smell_config['compiled'] = re.compile(smell_config['pattern'], re.MULTILINE | re.DOTALL)
+            else:
+                smell_config['compiled'] = None
+        
+        return smell_patterns
     
     def _initialize_language_patterns(self) -> Dict[str, Dict[str, str]]:
         """Initialize language-specific patterns."""
@@ -190,33 +313,29 @@ class CodeSmellAnalyzer:
         # Initialize analysis data
         all_smells = []
         smells_by_type: Counter[str] = Counter()
-        smells_by_file = defaultdict(list)
         severity_distribution: Counter[str] = Counter()
         file_smell_scores = {}
         
-        # Process each file
-        for i, file_path in enumerate(source_files):
+        # Process each file; per-file analysis runs in worker processes and the
+        # results are merged here in input order
+        file_results = zip(source_files, map_files(self._analyze_file_smells_safe, source_files))
+        for i, (file_path, file_smells) in enumerate(file_results):
             if i % 25 == 0:
                 print(f"  🔍 Analyzing {i+1}/{len(source_files)}: {file_path.name}")
             
             try:
-                # Skip large files for speed
-                if file_path.stat().st_size > 100 * 1024:  # 100KB limit
-                    print(f"  ⚠️  Skipping large file: {file_path.name}")
-                    continue
-                    
-                file_smells = self._analyze_file_smells_fast(file_path)
                 if file_smells:
-                    all_smells.extend(file_smells)
+                    # Only the first smells are reported, so stop collecting once the cap is hit
+                    if len(all_smells) < _REPORTED_SMELLS:
+                        all_smells.extend(file_smells[:_REPORTED_SMELLS - len(all_smells)])
                     
-                    # Group by type and file
-                    for smell in file_smells:
-                        smells_by_type[smell['type']] += 1
-                        smells_by_file[str(file_path)].append(smell)
-                        severity_distribution[smell['severity']] += 1
+                    # Group by type and severity, one counter update per file
+                    file_severities = Counter(smell.severity for smell in file_smells)
+                    smells_by_type.update(smell.type for smell in file_smells)
+                    severity_distribution.update(file_severities)
                     
                     # Calculate file smell score
-                    file_score = self._calculate_file_smell_score(file_smells)
+                    file_score = self._weighted_severity_total(file_severities)
                     file_smell_scores[str(file_path)] = file_score
                     
             except Exception as e:
@@ -224,15 +343,11 @@ class CodeSmellAnalyzer:
                 continue
         
         # Calculate overall metrics
-        total_smells = len(all_smells)
+        total_smells = sum(smells_by_type.values())
         severity_score = self._calculate_severity_score(severity_distribution)
         
         # Identify hotspot files (files with most smells)
-        hotspot_files = sorted(
-            file_smell_scores.items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )[:10]
+        hotspot_files = heapq.nlargest(10, file_smell_scores.items(), key=itemgetter(1))
         
         # Generate insights and recommendations
         insights = self._generate_smell_insights(
@@ -250,10 +365,18 @@ class CodeSmellAnalyzer:
             severity_score=round(severity_score, 1),
             smells_by_type=dict(smells_by_type),
             hotspot_files=[file_path for file_path, score in hotspot_files],
-            smells=all_smells[:50]  # Limit to first 50 for performance
+            smells=[smell._asdict() for smell in all_smells]
         )
     
-    def _analyze_file_smells(self, file_path: Path) -> List[Dict[str, Any]]:
+    def _analyze_file_smells_safe(self, file_path: Path) -> List[Smell]:
+        """Run the fast analysis on one file, reporting errors instead of raising."""
+        try:
+            return self._analyze_file_smells_fast(file_path)
+        except Exception as e:
+            print(f"  ⚠️  Error analyzing {file_path.name}: {str(e)[:50]}...")
+            return []
+    
+    def _analyze_file_smells(self, file_path: Path) -> List[Smell]:
         """Analyze code smells in a single file."""
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -269,33 +392,64 @@ class CodeSmellAnalyzer:
         lang_patterns = self.language_patterns.get(language, {})
         
         smells_found = []
-        lines = content.split('\n')
+        line_starts = self._line_starts(content)
+        # Each marker literal is searched for once per file, however many
+        # patterns share it
+        present_literals = {literal for literal in self._marker_literals if literal in content}
+        
+        # One pass for all token-level smells, dispatched by group name
+        fused_counts: Counter[str] = Counter()
+        fused_matches: Dict[str, List[Any]] = defaultdict(list)
+        for match in self._fused_pattern.finditer(content):
+            fused_type = match.lastgroup
+            fused_counts[fused_type] += 1
+            if len(fused_matches[fused_type]) < 5:
+                fused_matches[fused_type].append(match)
         
         # Analyze each smell pattern
         for smell_type, smell_config in self.smell_patterns.items():
-            pattern = smell_config['pattern']
+            # Cheap substring check before running the regex engine
+            required_literals = smell_config['required_literals']
+            if required_literals and present_literals.isdisjoint(required_literals):
+                continue
+            
+            pattern = smell_config['compiled']
             threshold = smell_config['threshold']
             severity = smell_config['severity']
             description = smell_config['description']
             
             # Find matches
-            matches = list(re.finditer(pattern, content, re.MULTILINE | re.DOTALL))
+            if smell_type in self._FUSED_SMELLS:
+                matches = fused_matches[smell_type]
+                match_count = fused_counts[smell_type]
+            elif pattern is None:
+                matches = []
+                match_count = 0
+            elif smell_type in ('long_method', 'large_class', 'long_parameter_list'):
+                # Size-based smells inspect every match
+                matches = list(pattern.finditer(content))
+                match_count = len(matches)
+            else:
+                # Only the threshold check and the first five matches are used,
+                # so stop scanning once both are settled
+                matches = list(islice(pattern.finditer(content), max(threshold, 5)))
+                match_count = len(matches)
             
             if smell_type in ['long_method', 'large_class']:
                 # Special handling for size-based smells
                 for match in matches:
                     actual_size = self._calculate_code_block_size(match.group(0))
                     if actual_size > threshold:
-                        line_num = content[:match.start()].count('\n') + 1
-                        smells_found.append({
-                            'type': smell_type,
-                            'severity': severity,
-                            'file': str(file_path),
-                            'line': line_num,
-                            'description': f"{description} ({actual_size} lines)",
-                            'context': self._extract_context(lines, line_num),
-                            'suggestion': self._get_smell_suggestion(smell_type)
-                        })
+                        line_num = bisect_right(line_starts, match.start())
+                        smells_found.append(Smell(
+                            type=smell_type,
+                            severity=severity,
+                            file=str(file_path),
+                            line=line_num,
+                            description=f"{description} ({actual_size} lines)",
+                            context=self._extract_context(content, line_starts, line_num),
+                            suggestion=self._get_smell_suggestion(smell_type)
+                        ))
             
             elif smell_type == 'long_parameter_list':
                 # Special handling for parameter counting
@@ -305,136 +459,236 @@ class CodeSmellAnalyzer:
                         # Count parameters (split by comma, filter empty)
                         params = [p.strip() for p in params_str.split(',') if p.strip()]
                         if len(params) > threshold:
-                            line_num = content[:match.start()].count('\n') + 1
-                            smells_found.append({
-                                'type': smell_type,
-                                'severity': severity,
-                                'file': str(file_path),
-                                'line': line_num,
-                                'description': f"{description} ({len(params)} parameters)",
-                                'context': self._extract_context(lines, line_num),
-                                'suggestion': self._get_smell_suggestion(smell_type)
-                            })
+                            line_num = bisect_right(line_starts, match.start())
+                            smells_found.append(Smell(
+                                type=smell_type,
+                                severity=severity,
+                                file=str(file_path),
+                                line=line_num,
+                                description=f"{description} ({len(params)} parameters)",
+                                context=self._extract_context(content, line_starts, line_num),
+                                suggestion=self._get_smell_suggestion(smell_type)
+                            ))
             
             elif smell_type == 'duplicate_code':
                 # Special handling for duplicate code
-                duplicates = self._find_duplicate_blocks(content)
+                duplicates = self._find_duplicate_blocks(content) + self._find_duplicate_blocks_rk(content.split('\n'))
                 for dup_info in duplicates:
-                    smells_found.append({
-                        'type': smell_type,
-                        'severity': severity,
-                        'file': str(file_path),
-                        'line': dup_info['line'],
-                        'description': f"{description} ({dup_info['size']} chars, {dup_info['occurrences']} times)",
-                        'context': dup_info['context'],
-                        'suggestion': self._get_smell_suggestion(smell_type)
-                    })
+                    smells_found.append(Smell(
+                        type=smell_type,
+                        severity=severity,
+                        file=str(file_path),
+                        line=dup_info['line'],
+                        description=f"{description} ({dup_info['size']} chars, {dup_info['occurrences']} times)",
+                        context=dup_info['context'],
+                        suggestion=self._get_smell_suggestion(smell_type)
+                    ))
             
             else:
                 # Standard pattern matching
-                if len(matches) >= threshold:
+                if match_count >= threshold:
                     for match in matches[:5]:  # Limit to first 5 occurrences
-                        line_num = content[:match.start()].count('\n') + 1
-                        smells_found.append({
-                            'type': smell_type,
-                            'severity': severity,
-                            'file': str(file_path),
-                            'line': line_num,
-                            'description': description,
-                            'context': self._extract_context(lines, line_num),
-                            'suggestion': self._get_smell_suggestion(smell_type)
-                        })
+                        line_num = bisect_right(line_starts, match.start())
+                        smells_found.append(Smell(
+                            type=smell_type,
+                            severity=severity,
+                            file=str(file_path),
+                            line=line_num,
+                            description=description,
+                            context=self._extract_context(content, line_starts, line_num),
+                            suggestion=self._get_smell_suggestion(smell_type)
+                        ))
         
         return smells_found
     
-    def _analyze_file_smells_fast(self, file_path: Path) -> List[Dict[str, Any]]:
-        """Fast code smell analysis - optimized for speed."""
+    def _analyze_file_smells_fast(self, file_path: Path) -> List[Smell]:
+        """Fast code smell analysis - optimized for speed.
+        
+        Pure ASCII files are memory-mapped and scanned as bytes, so files of
+        any size are analyzed without reading them into a single string. Other
+        files are decoded the way text mode reads them (UTF-8, universal
+        newlines), so their characters, digits and blank lines count as text.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []
+                content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         except Exception:
             return []
         
-        if not content.strip():
-            return []
+        with content:
+            if not self._compiled_fast['non_ascii'].search(content):
+                if not self._compiled_fast['non_whitespace'].search(content):
+                    return []
+                return self._find_fast_smells(str(file_path), content)
+            text = content[:].decode('utf-8', errors='ignore')
         
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if not text.strip():
+            return []
+        return self._find_fast_smells(str(file_path), text.encode('utf-8'), text)
+    
+    def _find_fast_smells(self, file_name: str, content: Union[mmap.mmap, bytes],
+                          text: Optional[str] = None) -> List[Smell]:
+        """Find the fast path's smells in a file's bytes.
+        
+        For a non-ASCII file, text is its decoded content and content the UTF-8
+        encoding of that text; parameter lists and magic numbers are then
+        searched in the text, where word characters and digits are Unicode ones.
+        """
         smells_found = []
-        lines = content.split('\n')
         
         # Quick smell detection using simple checks
         
-        # Long methods (simple line count)
-        for i, line in enumerate(lines):
-            if 'def ' in line:
-                method_lines = 0
-                for j in range(i+1, min(i+51, len(lines))):
-                    if lines[j].startswith('def ') or (lines[j].strip() and not lines[j].startswith(' ') and not lines[j].startswith('\t')):
-                        break
-                    method_lines += 1
-                
-                if method_lines > 30:
-                    smells_found.append({
-                        'type': 'long_method',
-                        'severity': 'medium',
-                        'line': i + 1,
-                        'description': f'Method has {method_lines} lines (>30)',
-                        'file': str(file_path)
-                    })
-        
-        # Long lines
-        for i, line in enumerate(lines):
-            if len(line) > 120:
-                smells_found.append({
-                    'type': 'long_line',
-                    'severity': 'low',
-                    'line': i + 1,
-                    'description': f'Line length: {len(line)} characters (>120)',
-                    'file': str(file_path)
-                })
+        # Files without 'def' cannot have long methods or parameter lists,
+        # so one substring search decides whether those scans run at all
+        has_def = content.find(b'def') != -1
+        
+        # Long methods and long lines come from array operations over the
+        # file's bytes rather than a Python loop over every line
+        line_starts, long_methods, long_lines = self._scan_line_structure(content, has_def)
+        for line_index, method_lines in long_methods:
+            smells_found.append(Smell(
+                type='long_method',
+                severity='medium',
+                line=line_index + 1,
+                description=f'Method has {method_lines} lines (>30)',
+                file=file_name
+            ))
+        for line_index, line_length in long_lines:
+            smells_found.append(Smell(
+                type='long_line',
+                severity='low',
+                line=line_index + 1,
+                description=f'Line length: {line_length} characters (>120)',
+                file=file_name
+            ))
+        
+        if len(smells_found) >= _FAST_SMELLS_PER_FILE:
+            return smells_found[:_FAST_SMELLS_PER_FILE]
+        
+        # Decoded text is searched with str patterns, and its matches placed by
+        # character offsets rather than byte offsets
+        if text is None:
+            searched, parameter_list, magic_number = (
+                content, self._compiled_fast['parameter_list'], self._compiled_fast['magic_number']
+            )
+        else:
+            searched, parameter_list, magic_number = (
+                text, self._compiled_fast['text_parameter_list'], self._compiled_fast['text_magic_number']
+            )
+            line_starts = self._line_starts(text)
         
         # Too many parameters (simple regex)
-        import re
-        param_matches = re.finditer(r'def\s+\w+\(([^)]*)\)', content)
+        param_matches = parameter_list.finditer(searched) if has_def else ()
         for match in param_matches:
-            params = match.group(1).split(',')
+            params = match.group(1).split(b',' if text is None else ',')
             if len(params) > 5:
-                line_num = content[:match.start()].count('\n') + 1
-                smells_found.append({
-                    'type': 'long_parameter_list',
-                    'severity': 'medium',
-                    'line': line_num,
-                    'description': f'Method has {len(params)} parameters (>5)',
-                    'file': str(file_path)
-                })
-        
-        # Magic numbers (simple detection)
-        magic_numbers = re.finditer(r'\b\d{2,}\b', content)
+                line_num = bisect_right(line_starts, match.start())
+                smells_found.append(Smell(
+                    type='long_parameter_list',
+                    severity='medium',
+                    line=line_num,
+                    description=f'Method has {len(params)} parameters (>5)',
+                    file=file_name
+                ))
+        
+        # Magic numbers (simple detection); only as many as still fit in the
+        # per-file limit are scanned for, since any later ones are dropped
+        remaining = _FAST_SMELLS_PER_FILE - len(smells_found)
+        magic_numbers = islice(magic_number.finditer(searched), max(remaining, 0))
         for match in magic_numbers:
-            line_num = content[:match.start()].count('\n') + 1
-            smells_found.append({
-                'type': 'magic_number',
-                'severity': 'low',
-                'line': line_num,
-                'description': f'Magic number: {match.group()}',
-                'file': str(file_path)
-            })
+            line_num = bisect_right(line_starts, match.start())
+            number = match.group()
+            smells_found.append(Smell(
+                type='magic_number',
+                severity='low',
+                line=line_num,
+                description=f'Magic number: {number.decode() if text is None else number}',
+                file=file_name
+            ))
+        
+        return smells_found[:_FAST_SMELLS_PER_FILE]
+    
+    def _scan_line_structure(
+        self, content: Union[mmap.mmap, bytes], has_def: bool = True
+    ) -> Tuple[List[int], List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """Find the line layout, long methods and long lines of a file's UTF-8 bytes.
+        
+        Returns the line start offsets, (line index, line count) of methods over
+        30 lines in reporting order, and (line index, characters) of lines over
+        120 characters. Lines end at LF, CRLF or a lone CR, as in text mode.
+        A method is a line containing 'def '; it ends before the next non-blank
+        unindented line, is counted as 50 lines once it reaches that length, and
+        otherwise runs to the end of the file. has_def=False skips the method
+        search for files known not to contain 'def'.
+        """
+        data = np.frombuffer(content, dtype=np.uint8)
+        is_newline = data == ord('\n')
+        if content.find(b'\r') == -1:
+            line_breaks = np.flatnonzero(is_newline)
+            line_ends = np.append(line_breaks, len(data))
+        else:
+            # A CR ends a line unless an LF follows it; a CRLF line ends before the CR
+            is_return = data == ord('\r')
+            is_return[:-1] &= ~is_newline[1:]
+            line_breaks = np.flatnonzero(is_newline | is_return)
+            line_ends = np.append(line_breaks, len(data))
+            after_return = np.flatnonzero(is_newline[1:] & (data[:-1] == ord('\r'))) + 1
+            line_ends[np.searchsorted(line_breaks, after_return)] -= 1
+        line_starts = np.concatenate(([0], line_breaks + 1))
+        last_line = len(line_starts) - 1
+        
+        # Long lines: byte length first, then the decoded length of the candidates
+        long_lines = []
+        for i in np.flatnonzero(line_ends - line_starts > 120).tolist():
+            line_length = len(content[line_starts[i]:line_ends[i]].decode('utf-8', errors='ignore'))
+            if line_length > 120:
+                long_lines.append((i, line_length))
+        
+        # Lines that end a method: non-blank and not starting with a space or tab;
+        # lines that may be blank to str.strip() are decoded to tell
+        non_empty = np.flatnonzero(line_ends > line_starts)
+        first_bytes = data[line_starts[non_empty]]
+        indented = (first_bytes == ord(' ')) | (first_bytes == ord('\t'))
+        maybe_blank = _MAYBE_BLANK_FIRST_BYTES[first_bytes]
+        scope_ends = non_empty[~indented & ~maybe_blank]
+        non_blank = [
+            i for i in non_empty[maybe_blank].tolist()
+            if content[line_starts[i]:line_ends[i]].decode('utf-8', errors='ignore').strip()
+        ]
+        if non_blank:
+            scope_ends = np.sort(np.concatenate((scope_ends, non_blank)))
+        
+        def_offsets = [
+            match.start() for match in self._compiled_fast['def_keyword'].finditer(content)
+        ] if has_def else []
+        method_starts = np.unique(np.searchsorted(line_starts, def_offsets, side='right') - 1)
+        
+        # Close each method at the first scope end after it, after 50 lines, or at EOF
+        next_end = np.searchsorted(scope_ends, method_starts, side='right')
+        scope_end = np.append(scope_ends, last_line + 51)[next_end]
+        ends_in_scope = scope_end <= method_starts + 50
+        reaches_cap = method_starts + 50 <= last_line
+        method_lines = np.where(
+            ends_in_scope, scope_end - method_starts - 1,
+            np.where(reaches_cap, 50, last_line - method_starts)
+        )
         
-        return smells_found[:10]  # Limit to 10 smells per file
+        long = method_lines > 30
+        long_methods = list(zip(method_starts[long].tolist(), method_lines[long].tolist()))
+        
+        return line_starts.tolist(), long_methods, long_lines
     
     def _detect_language(self, file_extension: str) -> str:
         """Detect programming language from file extension."""
-        extension_map = {
-            '.py': 'python',
-            '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
-            '.java': 'java',
-            '.c': 'c', '.cpp': 'c', '.cc': 'c', '.cxx': 'c',
-            '.cs': 'csharp',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.go': 'go',
-            '.rs': 'rust'
-        }
-        return extension_map.get(file_extension, 'generic')
+        return _EXT_MAP.get(file_extension, 'generic')
+    
+    def _line_starts(self, content: str) -> List[int]:
+        """Offsets at which each line of content starts, for bisecting match positions."""
+        return [0] + [match.end() for match in self._newline_re.finditer(content)]
     
     def _calculate_code_block_size(self, block: str) -> int:
         """Calculate the actual size of a code block (non-empty lines)."""
@@ -446,8 +700,7 @@ class CodeSmellAnalyzer:
         duplicates = []
         
         # Look for repeated validation patterns (common in the test case)
-        validation_pattern = r'if .{5,} <= 0:\s*raise ValueError\(["\'][^"\']*["\']?\)'
-        matches = re.findall(validation_pattern, content, re.MULTILINE)
+        matches = self._compiled_fast['validation_block'].findall(content)
         
         if len(matches) >= 2:
             duplicates.append({
@@ -458,8 +711,7 @@ class CodeSmellAnalyzer:
             })
         
         # Look for repeated method signatures
-        method_pattern = r'def \w+\([^)]*\):\s*if'
-        method_matches = re.findall(method_pattern, content, re.MULTILINE)
+        method_matches = self._compiled_fast['method_block'].findall(content)
         
         if len(method_matches) >= 2:
             duplicates.append({
@@ -471,11 +723,70 @@ class CodeSmellAnalyzer:
         
         return duplicates
     
-    def _extract_context(self, lines: List[str], line_num: int, context_size: int = 2) -> str:
-        """Extract context around a specific line."""
+    def _find_duplicate_blocks_rk(self, lines: List[str], window: int = 6,
+                                  min_chars: int = 40) -> List[Dict[str, Any]]:
+        """Find repeated blocks of ``window`` normalized lines with a rolling hash.
+        
+        Blank lines are ignored and indentation is stripped, so the scan is a
+        single linear pass over the file regardless of how repetitive it is.
+        """
+        normalized = [(i + 1, line.strip()) for i, line in enumerate(lines) if line.strip()]
+        if len(normalized) < window * 2:
+            return []
+        
+        modulus = (1 << 61) - 1
+        base = 1_000_003
+        top_power = pow(base, window - 1, modulus)
+        line_hashes = [hash(text) % modulus for _, text in normalized]
+        
+        windows_by_hash: Dict[int, List[int]] = defaultdict(list)
+        rolling = 0
+        for i, line_hash in enumerate(line_hashes):
+            if i >= window:
+                rolling = (rolling - line_hashes[i - window] * top_power) % modulus
+            rolling = (rolling * base + line_hash) % modulus
+            if i >= window - 1:
+                windows_by_hash[rolling].append(i - window + 1)
+        
+        duplicates = []
+        reported_until = -1
+        candidates = sorted(starts for starts in windows_by_hash.values() if len(starts) > 1)
+        for starts in candidates:
+            first = starts[0]
+            if first <= reported_until:
+                # Continuation of a block that was already reported
+                continue
+            
+            block = [text for _, text in normalized[first:first + window]]
+            occurrences = [
+                start for start in starts
+                if [text for _, text in normalized[start:start + window]] == block
+            ]
+            size = sum(len(text) for text in block)
+            if len(occurrences) < 2 or size < min_chars:
+                continue
+            
+            reported_until = first + window - 1
+            duplicates.append({
+                'line': normalized[first][0],
+                'size': size,
+                'occurrences': len(occurrences),
+                'context': ' | '.join(block)[:100]
+            })
+        
+        return duplicates
+    
+    def _extract_context(self, content: str, line_starts: List[int], line_num: int,
+                         context_size: int = 2) -> str:
+        """Extract context around a specific line.
+        
+        Only the window of lines around line_num is sliced out of content, using
+        the line start offsets, so files never need to be split into lines.
+        """
         start = max(0, line_num - context_size - 1)
-        end = min(len(lines), line_num + context_size)
-        context_lines = lines[start:end]
+        end = min(len(line_starts), line_num + context_size)
+        end_offset = line_starts[end] if end < len(line_starts) else len(content)
+        context_lines = content[line_starts[start]:end_offset].split('\n')
         return ' | '.join(line.strip() for line in context_lines if line.strip())[:100]
     
     def _get_smell_suggestion(self, smell_type: str) -> str:
@@ -506,31 +817,21 @@ class CodeSmellAnalyzer:
         
         return suggestions.get(smell_type, 'Consider refactoring this code')
     
-    def _calculate_file_smell_score(self, smells: List[Dict[str, Any]]) -> float:
+    def _calculate_file_smell_score(self, smells: List[Smell]) -> float:
         """Calculate smell score for a file."""
         if not smells:
             return 0.0
         
-        total_weight = 0.0
-        for smell in smells:
-            severity = smell['severity']
-            weight = self.severity_weights.get(severity, 1.0)
-            total_weight += weight
-        
-        return total_weight
+        return self._weighted_severity_total(Counter(smell.severity for smell in smells))
     
     def _calculate_severity_score(self, severity_distribution: Counter) -> float:
         """Calculate overall severity score (0-10 scale)."""
         if not severity_distribution:
             return 10.0
         
-        total_weight = 0.0
+        total_weight = self._weighted_severity_total(severity_distribution)
         total_count = sum(severity_distribution.values())
         
-        for severity, count in severity_distribution.items():
-            weight = self.severity_weights.get(severity, 1.0)
-            total_weight += weight * count
-        
         # Normalize to 0-10 scale (lower is better)
         max_possible_weight = total_count * 4.0  # If all were critical
         if max_possible_weight == 0:
@@ -539,6 +840,14 @@ class CodeSmellAnalyzer:
         severity_ratio = total_weight / max_possible_weight
         return max(0, 10 - (severity_ratio * 10))
     
+    def _weighted_severity_total(self, severity_counts: Dict[str, int]) -> float:
+        """Sum of severity weights over smell counts, as a single dot product."""
+        unknown = len(self._severity_index)
+        counts = np.zeros(len(self._severity_weight_vector), dtype=np.float64)
+        for severity, count in severity_counts.items():
+            counts[self._severity_index.get(severity, unknown)] += count
+        return float(counts @ self._severity_weight_vector)
+    
     def _generate_smell_insights(self, smells_by_type: Counter, 
                                severity_distribution: Counter,
                                hotspot_files: List[Tuple[str, float]]) -> Dict[str, Any]:
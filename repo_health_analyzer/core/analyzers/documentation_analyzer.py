@@ -1,11 +1,77 @@
 """Advanced documentation analyzer using regex patterns and file analysis."""
 
+import codecs
+import mmap
 import re
 import os
 from pathlib import Path
-from typing import List, Dict, Set, Tuple, Any, Optional
+from typing import List, Dict, Set, Tuple, Any, Optional, Iterator
 from collections import defaultdict, Counter
+import numpy as np
 from ...models.simple_report import DocumentationMetrics, AnalysisConfig
+from .parallel import map_files
+
+# Below this many characters the str.strip() loop classifies lines faster than NumPy
+_VECTORIZE_MIN_CHARS = 65536
+
+# Byte lookup table of the ASCII characters str.strip() removes, bar the newline
+_IS_STRIP_BYTE = np.zeros(256, dtype=bool)
+_IS_STRIP_BYTE[list(b' \t\r\x0b\x0c\x1c\x1d\x1e\x1f')] = True
+
+# Documentation files larger than this are only scored on their first _DOC_HEAD_CHARS
+_DOC_FULL_READ_BYTES = 1024 * 1024
+_DOC_HEAD_CHARS = 64 * 1024
+
+# Source files at least this large are memory-mapped rather than read into a copy
+_MMAP_MIN_BYTES = 512 * 1024
+
+# Undocumented items kept for reporting, per file and overall; the rest are only counted
+_MAX_UNDOCUMENTED_ITEMS = 1000
+
+# Language names are interned literals shared by every result, so the
+# comparisons on them below mostly resolve on identity
+_EXTENSION_LANGUAGES = {
+    '.py': 'python',
+    '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
+    '.java': 'java',
+    '.c': 'c', '.cpp': 'c', '.cc': 'c', '.cxx': 'c',
+    '.cs': 'csharp',
+    '.php': 'php',
+    '.rb': 'ruby',
+    '.go': 'go',
+    '.rs': 'rust'
+}
+
+# Keywords every function or class definition pattern of a language requires
+_DEFINITION_KEYWORDS = {
+    'python': ('def', 'class'),
+    'javascript': ('function', 'const', 'class'),
+    'java': ('class',),
+}
+
+# Languages whose definitions may be preceded by a /** ... */ doc block
+_DOC_BLOCK_LANGUAGES = frozenset({'javascript', 'java'})
+
+# Prefixes that mark a stripped line as a comment, for one str.startswith call
+_COMMENT_PREFIXES = {
+    'python': ('#',),
+    'javascript': ('//', '/*', '*'),
+    'java': ('//', '/*', '*'),
+    'c': ('//', '/*', '*'),
+}
+_DEFAULT_COMMENT_PREFIXES = ('#', '//')
+_C_STYLE_LANGUAGES = frozenset(
+    language for language, prefixes in _COMMENT_PREFIXES.items() if '/*' in prefixes
+)
+
+# Regex metacharacters that end literal expansion of a file name pattern
+_PATTERN_METACHARS = frozenset('.^$*+?{}[]|()')
+
+# Directories that hold tooling or third-party files rather than project docs
+_SKIP_DIRS = frozenset({
+    '.git', 'node_modules', '__pycache__', 'venv', '.venv', '.tox', '.mypy_cache', '.pytest_cache'
+})
+
 
 class DocumentationAnalyzer:
     def __init__(self, config: AnalysisConfig):
@@ -13,13 +79,58 @@ class DocumentationAnalyzer:
         self.doc_patterns = self._initialize_doc_patterns()
         self.doc_file_patterns = self._initialize_doc_file_patterns()
         self.language_patterns = self._initialize_language_patterns()
+        # Patterns are compiled once with the flags they are searched with
+        self._compiled_language_patterns = {
+            language: {name: re.compile(pattern, re.MULTILINE) for name, pattern in patterns.items()}
+            for language, patterns in self.language_patterns.items()
+        }
+        # One alternation per doc type, so each file name is tested once per type
+        for file_config in self.doc_file_patterns.values():
+            file_config['compiled'] = re.compile(
+                '|'.join(f'(?:{pattern})' for pattern in file_config['patterns']), re.IGNORECASE
+            )
+        # Name patterns made of literals and (a|b) groups are expanded into suffixes,
+        # so a file name is classified by str.endswith rather than regex searches
+        self._doc_name_suffixes: Dict[str, Tuple[str, ...]] = {}
+        self._doc_name_regexes: List[Tuple[str, re.Pattern]] = []
+        for doc_type, file_config in self.doc_file_patterns.items():
+            expanded = [self._expand_name_pattern(pattern) for pattern in file_config['patterns']]
+            if all(suffixes is not None for suffixes in expanded):
+                self._doc_name_suffixes[doc_type] = tuple(dict.fromkeys(
+                    suffix for suffixes in expanded for suffix in suffixes
+                ))
+            else:
+                self._doc_name_regexes.append((doc_type, file_config['compiled']))
+        self._any_doc_name_suffix = tuple(
+            suffix for suffixes in self._doc_name_suffixes.values() for suffix in suffixes
+        )
+        # Each indicator only needs one match, so the patterns are reduced to the
+        # shortest text that proves one exists; keyword patterns are searched in the
+        # lowercased content, since IGNORECASE defeats the engine's prefix scan
+        self._quality_indicators = tuple(
+            (indicator, re.compile(pattern, re.MULTILINE), lowercase)
+            for indicator, (pattern, lowercase) in {
+                'installation': (r'install|setup|getting\s+started', True),
+                'usage': (r'usage|example|how\s+to|tutorial', True),
+                'api': (r'api|reference|documentation', True),
+                'links': (r'https?://|www\.', False),
+                'code_examples': (r'```|`\w+`|\n\s{4,}\w', False),
+                'headers': (r'#\s+\w|=\n|-\n', False),
+                'lists': (r'^[^\S\n]*[-*+]\s|\d\.\s', False)
+            }.items()
+        )
+        self._compiled_checks = {
+            'docstring_after_def': re.compile(r':\s*\n\s*(?:"""|\'\'\')'),
+            'doc_block_comment': re.compile(r'/\*\*.*?\*/', re.DOTALL),
+            'trailing_comment': re.compile(r'#.*\w|//.*\w'),
+        }
         
     def _initialize_doc_patterns(self) -> Dict[str, Dict[str, Any]]:
         """Initialize documentation detection patterns."""
         return {
             'python': {
-                'class_docstring': r'class\s+\w+.*?:\s*\n\s*["\']{{3}}(.*?)["\']{{3}}',
-                'function_docstring': r'def\s+\w+.*?:\s*\n\s*["\']{{3}}(.*?)["\']{{3}}',
+                'class_docstring': r'class\s+\w+.*?:\s*\n\s*(?:"""|\'\'\')(.*?)(?:"""|\'\'\')',
+                'function_docstring': r'def\s+\w+.*?:\s*\n\s*(?:"""|\'\'\')(.*?)(?:"""|\'\'\')',
                 'module_docstring': r'""".*?"""|\'\'\'.*?\'\'\'',
                 'inline_comments': r'#\s*(.+)',
                 'type_hints': r':\s*[A-Za-z_][A-Za-z0-9_\[\],\s]*\s*[=\)]',
@@ -85,23 +196,31 @@ class DocumentationAnalyzer:
         }
     
     def _initialize_language_patterns(self) -> Dict[str, Dict[str, str]]:
-        """Initialize language-specific code patterns."""
+        """Initialize language-specific code patterns.
+        
+        Leading indentation is matched with ``[^\S\n]*`` so a match never spans
+        blank lines, which keeps the line-anchored scans linear.
+        """
         return {
             'python': {
-                'class_def': r'^\s*class\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-                'function_def': r'^\s*def\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-                'public_method': r'^\s*def\s+([a-zA-Z][a-zA-Z0-9_]*)\s*\(',
-                'private_method': r'^\s*def\s+(_[a-zA-Z0-9_]*)\s*\('
+                'class_def': r'^[^\S\n]*class\s+([a-zA-Z_][a-zA-Z0-9_]*)',
+                'function_def': r'^[^\S\n]*(?:async\s+)?def\s+([a-zA-Z_][a-zA-Z0-9_]*)',
+                'definition': (
+                    r'^[^\S\n]*(?:(?:async\s+)?def\s+(?P<function>[a-zA-Z_][a-zA-Z0-9_]*)'
+                    r'|class\s+(?P<class>[a-zA-Z_][a-zA-Z0-9_]*))'
+                ),
+                'public_method': r'^[^\S\n]*def\s+([a-zA-Z][a-zA-Z0-9_]*)\s*\(',
+                'private_method': r'^[^\S\n]*def\s+(_[a-zA-Z0-9_]*)\s*\('
             },
             'javascript': {
-                'class_def': r'^\s*class\s+([a-zA-Z_$][a-zA-Z0-9_$]*)',
-                'function_def': r'^\s*(?:function\s+([a-zA-Z_$][a-zA-Z0-9_$]*)|const\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*=)',
-                'export': r'^\s*export\s+'
+                'class_def': r'^[^\S\n]*class\s+([a-zA-Z_$][a-zA-Z0-9_$]*)',
+                'function_def': r'^[^\S\n]*(?:function\s+([a-zA-Z_$][a-zA-Z0-9_$]*)|const\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*=)',
+                'export': r'^[^\S\n]*export\s+'
             },
             'java': {
-                'class_def': r'^\s*(?:public\s+)?class\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-                'method_def': r'^\s*(?:public|private|protected)\s+.*?\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(',
-                'public_method': r'^\s*public\s+.*?\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\('
+                'class_def': r'^[^\S\n]*(?:public\s+)?class\s+([a-zA-Z_][a-zA-Z0-9_]*)',
+                'method_def': r'^[^\S\n]*(?:public|private|protected)\s+.*?\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(',
+                'public_method': r'^[^\S\n]*public\s+.*?\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\('
             }
         }
     
@@ -137,40 +256,32 @@ class DocumentationAnalyzer:
         )
     
     def _analyze_documentation_files(self, repo_path: Path) -> Dict[str, Any]:
-        """Analyze documentation files in the repository."""
+        """Analyze documentation files in the repository.
+        
+        files_found maps each doc type present to its (path, quality) pairs.
+        """
         doc_analysis: Dict[str, Any] = {
             'files_found': {},
             'total_score': 0.0,
             'max_possible_score': 0.0,
-            'file_qualities': {},
             'missing_docs': []
         }
         
         # Scan for documentation files
+        files_by_type = self._find_documentation_files(repo_path)
         for doc_type, config in self.doc_file_patterns.items():
-            patterns = config['patterns']
             weight = config['weight']
             description = config['description']
             
             doc_analysis['max_possible_score'] += weight
-            found_files = []
-            
-            # Search for files matching patterns
-            for pattern in patterns:
-                for file_path in repo_path.rglob('*'):
-                    if file_path.is_file() and re.search(pattern, file_path.name, re.IGNORECASE):
-                        found_files.append(file_path)
+            found_files = files_by_type.get(doc_type, [])
             
             if found_files:
-                doc_analysis['files_found'][doc_type] = found_files
-                
                 # Analyze quality of found files
-                best_quality = 0.0
-                for file_path in found_files:
-                    quality = self._analyze_doc_file_quality(file_path)
-                    best_quality = max(best_quality, quality)
-                    doc_analysis['file_qualities'][str(file_path)] = quality
+                rated_files = [(file_path, self._analyze_doc_file_quality(file_path)) for file_path in found_files]
+                doc_analysis['files_found'][doc_type] = rated_files
                 
+                best_quality = max(quality for _, quality in rated_files)
                 doc_analysis['total_score'] += weight * best_quality
             else:
                 doc_analysis['missing_docs'].append({
@@ -181,15 +292,114 @@ class DocumentationAnalyzer:
         
         return doc_analysis
     
+    def _find_documentation_files(self, repo_path: Path) -> Dict[str, List[Path]]:
+        """Walk the repository once, grouping files by the doc types their names match."""
+        files_by_type: Dict[str, List[Path]] = defaultdict(list)
+        for file_name, file_path in self._iter_files(repo_path):
+            folded = file_name.casefold()
+            if folded.endswith(self._any_doc_name_suffix):
+                for doc_type, suffixes in self._doc_name_suffixes.items():
+                    if folded.endswith(suffixes):
+                        files_by_type[doc_type].append(Path(file_path))
+            for doc_type, pattern in self._doc_name_regexes:
+                if pattern.search(file_name):
+                    files_by_type[doc_type].append(Path(file_path))
+        
+        return files_by_type
+    
+    def _expand_name_pattern(self, pattern: str) -> Optional[Tuple[str, ...]]:
+        """Expand an end-anchored file name pattern into the case-folded suffixes it matches.
+        
+        Returns None for patterns that are not just literals, escapes and (a|b)
+        groups, optionally followed by '?'.
+        """
+        if not pattern.endswith('$') or pattern.endswith('\\$'):
+            return None
+        expansions = self._expand_literal_pattern(pattern[:-1])
+        if expansions is None:
+            return None
+        return tuple(expansion.casefold() for expansion in expansions)
+    
+    def _expand_literal_pattern(self, pattern: str) -> Optional[List[str]]:
+        """List every string a pattern of literals and (a|b) groups matches, or None."""
+        expansions = ['']
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char == '\\':
+                if i + 1 == len(pattern) or pattern[i + 1].isalnum():
+                    return None  # Character classes such as \d
+                options = [pattern[i + 1]]
+                i += 2
+            elif char == '(':
+                end = pattern.find(')', i)
+                group = pattern[i + 1:end]
+                if end == -1 or '(' in group or group.endswith('\\'):
+                    return None
+                options = []
+                for alternative in group.split('|'):
+                    expanded = self._expand_literal_pattern(alternative)
+                    if expanded is None:
+                        return None
+                    options.extend(expanded)
+                i = end + 1
+            elif char in _PATTERN_METACHARS:
+                return None
+            else:
+                options = [char]
+                i += 1
+            
+            if pattern[i:i + 1] == '?':
+                options.append('')
+                i += 1
+            expansions = [prefix + option for prefix in expansions for option in options]
+        return expansions
+    
+    def _iter_files(self, root: Path) -> Iterator[Tuple[str, str]]:
+        """Yield (name, path) of every regular file under root, in os.walk order.
+        
+        Works on os.scandir entries, whose cached file types avoid a stat per
+        entry; a Path is only built by the caller for files that match. As with
+        Path.is_file(), symlinks count by their target, so broken links, FIFOs
+        and sockets are left out.
+        """
+        stack = [os.fspath(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        try:
+                            is_file = entry.is_file()
+                            is_dir = not is_file and entry.is_dir()
+                        except OSError:
+                            continue
+                        if is_file:
+                            yield entry.name, entry.path
+                        elif is_dir and entry.name not in _SKIP_DIRS and not entry.is_symlink():
+                            subdirs.append(entry.path)
+            except OSError:
+                continue
+            stack.extend(reversed(subdirs))
+    
     def _analyze_doc_file_quality(self, file_path: Path) -> float:
         """Analyze the quality of a documentation file."""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            size: Optional[int] = os.stat(file_path).st_size
+        except OSError:
+            size = None
+        if size == 0:
+            return 0.0
+        
+        # The heuristics below cannot tell huge files apart, so only their head is read
+        read_limit = _DOC_HEAD_CHARS if size is not None and size > _DOC_FULL_READ_BYTES else -1
+        try:
+            content = self._read_text(file_path, read_limit)
         except Exception:
             return 0.0
         
-        if not content.strip():
+        # NUL characters near the start mean a binary file rather than documentation
+        if '\x00' in content[:4096] or not content.strip():
             return 0.0
         
         quality_score = 0.0
@@ -209,23 +419,19 @@ class DocumentationAnalyzer:
             quality_score += 0.1  # Very basic
         
         # Content quality indicators
-        quality_indicators = {
-            'installation': r'(?i)(install|setup|getting\s+started)',
-            'usage': r'(?i)(usage|example|how\s+to|tutorial)',
-            'api': r'(?i)(api|reference|documentation)',
-            'links': r'https?://|www\.',
-            'code_examples': r'```|`\w+`|\n\s{4,}\w+',
-            'headers': r'#+\s+\w+|=+\n|\-+\n',
-            'lists': r'^\s*[-*+]\s+|\d+\.\s+'
-        }
-        
-        for indicator, pattern in quality_indicators.items():
-            if re.search(pattern, content, re.MULTILINE):
+        lowered = content.lower()
+        for indicator, pattern, lowercase in self._quality_indicators:
+            if pattern.search(lowered if lowercase else content):
                 quality_score += 0.05
         
-        # Bonus for structured content
-        if re.search(r'#+.*#+.*#+', content, re.DOTALL):  # Multiple headers
-            quality_score += 0.1
+        # Bonus for structured content: at least three header lines
+        header_lines = 0
+        for line in non_empty_lines:
+            if line.lstrip().startswith('#'):
+                header_lines += 1
+                if header_lines == 3:
+                    quality_score += 0.1
+                    break
         
         # Penalty for very short content
         if len(content) < 100:
@@ -233,6 +439,43 @@ class DocumentationAnalyzer:
         
         return min(quality_score, 1.0)
     
+    def _read_text(self, file_path: Path, limit: int = -1) -> str:
+        """Read up to limit characters of a file as UTF-8, falling back to Latin-1.
+        
+        A UTF-8 byte order mark is dropped. Files that are not valid UTF-8 are
+        decoded as Latin-1, which maps every byte, rather than losing bytes.
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
+                return f.read(limit)
+        except UnicodeDecodeError:
+            with open(file_path, 'r', encoding='latin-1') as f:
+                return f.read(limit)
+    
+    def _read_mapped_source(self, file_path: Path, language: str) -> Tuple[str, Tuple[int, int]]:
+        """Decode a large file from a memory map, counting its lines on the mapped bytes.
+        
+        Decodes like _read_text, but the bytes are never copied out of the page
+        cache and the text is not encoded again for line classification.
+        """
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            offset = len(codecs.BOM_UTF8) if mapped[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+            try:
+                with memoryview(mapped) as whole, whole[offset:] as view:
+                    content, encoding = str(view, 'utf-8'), 'utf-8'
+            except UnicodeDecodeError:
+                # Like a Latin-1 text read, which keeps the BOM bytes as characters
+                offset = 0
+                content, encoding = str(mapped, 'latin-1'), 'latin-1'
+            if mapped.find(b'\r') != -1:
+                # Text mode translates \r and \r\n line endings; match it and count on the str
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+                return content, self._count_lines(content, language)
+            line_counts = self._count_encoded_lines(
+                np.frombuffer(mapped, dtype=np.uint8, offset=offset), language, encoding
+            )
+        return content, line_counts
+    
     def _analyze_code_documentation(self, source_files: List[Path]) -> Dict[str, Any]:
         """Analyze documentation within source code files."""
         code_doc_analysis: Dict[str, Any] = {
@@ -245,19 +488,20 @@ class DocumentationAnalyzer:
             'comment_density': 0.0,
             'type_hint_coverage': 0.0,
             'documentation_by_file': {},
-            'undocumented_items': []
+            'undocumented_items': [],
+            'total_undocumented': 0
         }
         
         total_lines = 0
         total_comment_lines = 0
         total_functions_with_hints = 0
         
-        # Quick fix: Limit file processing to prevent hanging
-        files_to_process = source_files[:5]  # Process only first 5 files
-        for i, file_path in enumerate(files_to_process):
-            print(f"  📄 Processing documentation {i+1}/{len(files_to_process)}: {file_path.name}")
+        # Per-file analysis runs in worker processes; results are merged here in input order
+        file_results = zip(source_files, map_files(self._analyze_file_documentation_safe, source_files))
+        for i, (file_path, file_analysis) in enumerate(file_results):
+            if i % 25 == 0:
+                print(f"  📄 Processing documentation {i+1}/{len(source_files)}: {file_path.name}")
             try:
-                file_analysis = self._analyze_file_documentation(file_path)
                 if file_analysis and isinstance(file_analysis, dict) and file_analysis:
                     # Aggregate counts
                     code_doc_analysis['total_functions'] += file_analysis['function_count']
@@ -276,8 +520,11 @@ class DocumentationAnalyzer:
                     # Store file-level analysis
                     code_doc_analysis['documentation_by_file'][str(file_path)] = file_analysis
                     
-                    # Track undocumented items
-                    code_doc_analysis['undocumented_items'].extend(file_analysis['undocumented_items'])
+                    # Track undocumented items, keeping the first few for reporting
+                    code_doc_analysis['total_undocumented'] += file_analysis['total_undocumented']
+                    room = _MAX_UNDOCUMENTED_ITEMS - len(code_doc_analysis['undocumented_items'])
+                    if room > 0:
+                        code_doc_analysis['undocumented_items'].extend(file_analysis['undocumented_items'][:room])
                     
             except Exception as e:
                 print(f"  ⚠️  Error analyzing {file_path.name}: {str(e)[:50]}...")
@@ -292,25 +539,40 @@ class DocumentationAnalyzer:
         
         return code_doc_analysis
     
+    def _analyze_file_documentation_safe(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Analyze one file, reporting errors instead of raising."""
+        try:
+            return self._analyze_file_documentation(file_path)
+        except Exception as e:
+            print(f"  ⚠️  Error analyzing {file_path.name}: {str(e)[:50]}...")
+            return {}
+    
     def _analyze_file_documentation(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """Analyze documentation in a single source file."""
+        # Detect language
+        language = self._detect_language(file_path.suffix.lower())
+        
+        try:
+            size = os.stat(file_path).st_size
+        except OSError:
+            size = 0
+        line_counts: Optional[Tuple[int, int]] = None
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            if size >= _MMAP_MIN_BYTES:
+                content, line_counts = self._read_mapped_source(file_path, language)
+            else:
+                content = self._read_text(file_path)
         except Exception:
             return {}
         
         if not content.strip():
             return {}
         
-        # Detect language
-        language = self._detect_language(file_path.suffix.lower())
-        doc_patterns = self.doc_patterns.get(language, self.doc_patterns['generic'])
-        lang_patterns = self.language_patterns.get(language, {})
+        lang_patterns = self._compiled_language_patterns.get(language, {})
         
         analysis: Dict[str, Any] = {
             'language': language,
-            'total_lines': len([line for line in content.split('\n') if line.strip()]),
+            'total_lines': 0,
             'comment_lines': 0,
             'function_count': 0,
             'documented_functions': 0,
@@ -318,138 +580,224 @@ class DocumentationAnalyzer:
             'documented_classes': 0,
             'has_module_doc': False,
             'functions_with_type_hints': 0,
-            'undocumented_items': []
+            'undocumented_items': [],
+            'total_undocumented': 0
         }
         
-        # Count comment lines
-        for line in content.split('\n'):
-            if self._is_comment_line(line, language):
-                analysis['comment_lines'] += 1
+        analysis['total_lines'], analysis['comment_lines'] = line_counts or self._count_lines(content, language)
         
         # Check for module-level documentation
         if language == 'python':
-            if re.search(doc_patterns.get('module_docstring', ''), content, re.DOTALL):
-                analysis['has_module_doc'] = True
-        
-        # Analyze functions
-        if 'function_def' in lang_patterns:
-            functions = re.finditer(lang_patterns['function_def'], content, re.MULTILINE)
-            for func_match in functions:
-                analysis['function_count'] += 1
-                func_name = func_match.group(1) if func_match.groups() else 'unknown'
-                
-                # Check if function is documented
-                if self._is_function_documented(content, func_match, doc_patterns, language):
-                    analysis['documented_functions'] += 1
-                else:
+            analysis['has_module_doc'] = self._has_triple_quoted_string(content)
+        
+        # Files without any definition keyword cannot match, so skip the scans
+        if any(keyword in content for keyword in _DEFINITION_KEYWORDS.get(language, ())):
+            function_matches, class_matches = self._find_definitions(content, lang_patterns)
+        else:
+            function_matches, class_matches = [], []
+        
+        # Analyze functions; matches come in source order, so line numbers are found
+        # by counting only the newlines since the previous undocumented item
+        line, counted_to = 1, 0
+        for func_match in function_matches:
+            analysis['function_count'] += 1
+            func_name = func_match.group(func_match.lastindex) if func_match.lastindex else 'unknown'
+            
+            # Check if function is documented
+            if self._is_function_documented(content, func_match, language):
+                analysis['documented_functions'] += 1
+            else:
+                analysis['total_undocumented'] += 1
+                if len(analysis['undocumented_items']) < _MAX_UNDOCUMENTED_ITEMS:
+                    line += content.count('\n', counted_to, func_match.start())
+                    counted_to = func_match.start()
                     analysis['undocumented_items'].append({
                         'type': 'function',
                         'name': func_name,
-                        'line': content[:func_match.start()].count('\n') + 1,
+                        'line': line,
                         'file': str(file_path)
                     })
-                
-                # Check for type hints (Python)
-                if language == 'python':
-                    func_line = func_match.group(0)
-                    if ':' in func_line and '->' in content[func_match.start():func_match.start()+200]:
-                        analysis['functions_with_type_hints'] += 1
+            
+            # Check for type hints (Python)
+            if language == 'python':
+                func_line = func_match.group(0)
+                if ':' in func_line and '->' in content[func_match.start():func_match.start()+200]:
+                    analysis['functions_with_type_hints'] += 1
         
         # Analyze classes
-        if 'class_def' in lang_patterns:
-            classes = re.finditer(lang_patterns['class_def'], content, re.MULTILINE)
-            for class_match in classes:
-                analysis['class_count'] += 1
-                class_name = class_match.group(1) if class_match.groups() else 'unknown'
-                
-                # Check if class is documented
-                if self._is_class_documented(content, class_match, doc_patterns, language):
-                    analysis['documented_classes'] += 1
-                else:
+        line, counted_to = 1, 0
+        for class_match in class_matches:
+            analysis['class_count'] += 1
+            class_name = class_match.group(class_match.lastindex) if class_match.lastindex else 'unknown'
+            
+            # Check if class is documented
+            if self._is_class_documented(content, class_match, language):
+                analysis['documented_classes'] += 1
+            else:
+                analysis['total_undocumented'] += 1
+                if len(analysis['undocumented_items']) < _MAX_UNDOCUMENTED_ITEMS:
+                    line += content.count('\n', counted_to, class_match.start())
+                    counted_to = class_match.start()
                     analysis['undocumented_items'].append({
                         'type': 'class',
                         'name': class_name,
-                        'line': content[:class_match.start()].count('\n') + 1,
+                        'line': line,
                         'file': str(file_path)
                     })
         
         return analysis
     
+    def _find_definitions(self, content: str,
+                          lang_patterns: Dict[str, re.Pattern]) -> Tuple[List[re.Match], List[re.Match]]:
+        """Find function and class definitions, in source order.
+        
+        Languages with a combined 'definition' pattern are scanned once, each
+        match telling by its named group which kind of definition it is.
+        """
+        if 'definition' in lang_patterns:
+            function_matches: List[re.Match] = []
+            class_matches: List[re.Match] = []
+            for match in lang_patterns['definition'].finditer(content):
+                if match.lastgroup == 'function':
+                    function_matches.append(match)
+                else:
+                    class_matches.append(match)
+            return function_matches, class_matches
+        
+        function_matches = list(lang_patterns['function_def'].finditer(content)) if 'function_def' in lang_patterns else []
+        class_matches = list(lang_patterns['class_def'].finditer(content)) if 'class_def' in lang_patterns else []
+        return function_matches, class_matches
+    
     def _detect_language(self, file_extension: str) -> str:
         """Detect programming language from file extension."""
-        extension_map = {
-            '.py': 'python',
-            '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
-            '.java': 'java',
-            '.c': 'c', '.cpp': 'c', '.cc': 'c', '.cxx': 'c',
-            '.cs': 'csharp',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.go': 'go',
-            '.rs': 'rust'
-        }
-        return extension_map.get(file_extension, 'generic')
+        return _EXTENSION_LANGUAGES.get(file_extension, 'generic')
     
-    def _is_comment_line(self, line: str, language: str) -> bool:
-        """Check if a line is a comment."""
-        stripped = line.strip()
+    def _has_triple_quoted_string(self, content: str) -> bool:
+        """Check for a closed triple-quoted string, as the module_docstring pattern does.
+        
+        Two substring scans per quote style replace the lazy DOTALL search, which
+        rescans to the end of the file from every unclosed opening quote.
+        """
+        for quote in ('"""', "'''"):
+            start = content.find(quote)
+            if start != -1 and content.find(quote, start + 3) != -1:
+                return True
+        return False
+    
+    def _count_lines(self, content: str, language: str) -> Tuple[int, int]:
+        """Count the non-blank lines of content and how many of them are comments."""
+        if len(content) < _VECTORIZE_MIN_CHARS:
+            prefixes = _COMMENT_PREFIXES.get(language, _DEFAULT_COMMENT_PREFIXES)
+            total_lines = comment_lines = 0
+            for line in content.split('\n'):
+                stripped = line.lstrip()
+                if stripped:
+                    total_lines += 1
+                    if stripped.startswith(prefixes):
+                        comment_lines += 1
+            return total_lines, comment_lines
+        
+        encoded = content.encode('utf-8', 'surrogatepass')
+        return self._count_encoded_lines(np.frombuffer(encoded, dtype=np.uint8), language, 'utf-8')
+    
+    def _count_encoded_lines(self, data: np.ndarray, language: str, encoding: str) -> Tuple[int, int]:
+        """Count non-blank and comment lines of encoded text by each line's first non-whitespace byte."""
+        size = len(data)
+        if not size:
+            return 0, 0
+        
+        def byte_at(offsets: np.ndarray) -> np.ndarray:
+            # Offsets past the end read as NUL, which is neither whitespace nor a marker
+            return np.where(offsets < size, data[np.minimum(offsets, size - 1)], 0)
+        
+        newlines = np.flatnonzero(data == ord('\n'))
+        line_starts = np.concatenate(([0], newlines + 1))
+        line_ends = np.append(newlines, size)
+        
+        # Step past leading whitespace, one column per round, on the lines still in it
+        first = line_starts.copy()
+        indented = np.flatnonzero(_IS_STRIP_BYTE[byte_at(first)])
+        while indented.size:
+            first[indented] += 1
+            indented = indented[_IS_STRIP_BYTE[byte_at(first[indented])]]
+        non_blank = first < line_ends
+        first = first[non_blank]
+        lead, follow = data[first], byte_at(first + 1)
+        
         if language == 'python':
-            return stripped.startswith('#')
-        elif language in ['javascript', 'java', 'c']:
-            return stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*')
+            is_comment = lead == ord('#')
+        elif language in _C_STYLE_LANGUAGES:
+            is_comment = (lead == ord('*')) | (
+                (lead == ord('/')) & ((follow == ord('/')) | (follow == ord('*')))
+            )
         else:
-            return stripped.startswith('#') or stripped.startswith('//')
+            is_comment = (lead == ord('#')) | ((lead == ord('/')) & (follow == ord('/')))
+        
+        # Lines led by a non-ASCII character may still be blank (e.g. a no-break
+        # space), so those few are decoded and checked as strings
+        total_lines = int(np.count_nonzero(non_blank))
+        comment_lines = int(np.count_nonzero(is_comment))
+        for i in np.flatnonzero(non_blank)[lead >= 0x80].tolist():
+            line = data[line_starts[i]:line_ends[i]].tobytes().decode(encoding, 'surrogatepass')
+            stripped = line.strip()
+            if not stripped:
+                total_lines -= 1
+            elif self._is_comment_line(stripped, language):
+                comment_lines += 1
+        return total_lines, comment_lines
     
-    def _is_function_documented(self, content: str, func_match: re.Match, 
-                              doc_patterns: Dict[str, str], language: str) -> bool:
+    def _is_comment_line(self, line: str, language: str) -> bool:
+        """Check if a line is a comment."""
+        return line.strip().startswith(_COMMENT_PREFIXES.get(language, _DEFAULT_COMMENT_PREFIXES))
+    
+    def _is_function_documented(self, content: str, func_match: re.Match, language: str) -> bool:
         """Check if a function has documentation."""
         # Look for documentation after the function definition
         func_end = func_match.end()
         next_200_chars = content[func_end:func_end+200]
         
         if language == 'python':
-            # Look for docstring - fix the regex pattern
-            if re.search(r':\s*\n\s*["\']{{3}}', next_200_chars):
+            # Look for docstring
+            # Substring checks rule out most windows before the regex runs
+            has_quotes = '"""' in next_200_chars or "'''" in next_200_chars
+            if has_quotes and self._compiled_checks['docstring_after_def'].search(next_200_chars):
                 return True
-            # Also check for simple docstring pattern
-            if re.search(r':\s*\n\s*"""', next_200_chars):
-                return True
-        elif language in ['javascript', 'java']:
+        elif language in _DOC_BLOCK_LANGUAGES:
             # Look for JSDoc or Javadoc comment before function
             func_start = max(0, func_match.start() - 200)
             prev_200_chars = content[func_start:func_match.start()]
-            if re.search(r'/\*\*.*?\*/', prev_200_chars, re.DOTALL):
+            if '/**' in prev_200_chars and self._compiled_checks['doc_block_comment'].search(prev_200_chars):
                 return True
         
         # Generic comment check
-        if re.search(r'#.*\w+|//.*\w+', next_200_chars):
+        has_marker = '#' in next_200_chars or '//' in next_200_chars
+        if has_marker and self._compiled_checks['trailing_comment'].search(next_200_chars):
             return True
         
         return False
     
-    def _is_class_documented(self, content: str, class_match: re.Match,
-                           doc_patterns: Dict[str, str], language: str) -> bool:
+    def _is_class_documented(self, content: str, class_match: re.Match, language: str) -> bool:
         """Check if a class has documentation."""
         # Look for documentation after the class definition
         class_end = class_match.end()
         next_300_chars = content[class_end:class_end+300]
         
         if language == 'python':
-            # Look for class docstring - fix the regex pattern
-            if re.search(r':\s*\n\s*["\']{{3}}', next_300_chars):
-                return True
-            # Also check for simple docstring pattern
-            if re.search(r':\s*\n\s*"""', next_300_chars):
+            # Look for class docstring
+            # Substring checks rule out most windows before the regex runs
+            has_quotes = '"""' in next_300_chars or "'''" in next_300_chars
+            if has_quotes and self._compiled_checks['docstring_after_def'].search(next_300_chars):
                 return True
-        elif language in ['javascript', 'java']:
+        elif language in _DOC_BLOCK_LANGUAGES:
             # Look for JSDoc or Javadoc comment before class
             class_start = max(0, class_match.start() - 300)
             prev_300_chars = content[class_start:class_match.start()]
-            if re.search(r'/\*\*.*?\*/', prev_300_chars, re.DOTALL):
+            if '/**' in prev_300_chars and self._compiled_checks['doc_block_comment'].search(prev_300_chars):
                 return True
         
         # Generic comment check
-        if re.search(r'#.*\w+|//.*\w+', next_300_chars):
+        has_marker = '#' in next_300_chars or '//' in next_300_chars
+        if has_marker and self._compiled_checks['trailing_comment'].search(next_300_chars):
             return True
         
         return False
@@ -469,8 +817,7 @@ class DocumentationAnalyzer:
         readme_quality = 0.0
         readme_files = doc_files_analysis['files_found'].get('readme_files', [])
         if readme_files:
-            readme_qualities = [doc_files_analysis['file_qualities'].get(str(f), 0.0) for f in readme_files]
-            readme_quality = max(readme_qualities) * 10
+            readme_quality = max(quality for _, quality in readme_files) * 10
         
         # Code documentation coverage (0-1)
         docstring_coverage = 0.0
@@ -506,5 +853,5 @@ class DocumentationAnalyzer:
             'api_doc_coverage': api_doc_coverage,
             'has_changelog': 'changelog_files' in doc_files_analysis['files_found'],
             'has_contributing_guide': 'contributing_files' in doc_files_analysis['files_found'],
-            'doc_files_count': len([f for files in doc_files_analysis['files_found'].values() for f in files])
+            'doc_files_count': sum(len(files) for files in doc_files_analysis['files_found'].values())
         }
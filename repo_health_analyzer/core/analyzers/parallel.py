@@ -0,0 +1,36 @@
+"""
+Per-file work shared by the analyzers, spread over a process pool for larger inputs.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, TypeVar
+
+_Item = TypeVar('_Item')
+_Result = TypeVar('_Result')
+
+# Below this many files the process pool start-up costs more than it saves
+_PARALLEL_MIN_FILES = 32
+
+
+def map_files(func: Callable[[_Item], _Result], files: List[_Item], chunksize: int = 16) -> Iterator[_Result]:
+    """
+    Apply func to every file, yielding the results in input order.
+
+    Files are independent, so inputs of _PARALLEL_MIN_FILES or more are spread
+    over a process pool; func, and the analyzer it is bound to, must pickle.
+
+    Args:
+        func: Function analyzing one file
+        files: Files to analyze
+        chunksize: Files sent to a worker at a time
+
+    Returns:
+        Iterator: func's result for each file, in order
+    """
+    if len(files) < _PARALLEL_MIN_FILES:
+        yield from map(func, files)
+        return
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        yield from executor.map(func, files, chunksize=chunksize)
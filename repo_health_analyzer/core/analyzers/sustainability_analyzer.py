@@ -2,18 +2,72 @@
 
 import re
 import math
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Set, Tuple, Any, Optional
 from collections import defaultdict, Counter
 from ...models.simple_report import SustainabilityMetrics, RepositoryInfo, AnalysisConfig
 
+# Commit messages that look like releases or version bumps
+_RELEASE_PATTERN = re.compile(r'(?i)(release|version|tag|v\d+\.\d+)')
+
+# Commit messages are lower-cased before matching, so the indicator patterns
+# drop their (?i) flag; these two characters survive lower() yet match an
+# ASCII letter case-insensitively, so they are folded by hand
+_CASE_INSENSITIVE_FLAG = '(?i)'
+_LOWER_CASE_EXTRAS = str.maketrans({'\u0131': 'i', '\u017f': 's'})
+
+# A pattern that is only a group of literal words, e.g. (fix|bug|issue)
+_KEYWORD_ALTERNATION = re.compile(r'\((\w+(?:\|\w+)*)\)')
+
+# Time windows the activity, contributor and trend analyses look back over
+_VERY_RECENT = timedelta(days=5)
+_MONTH = timedelta(days=30)
+_QUARTER = timedelta(days=90)
+_HALF_YEAR = timedelta(days=180)
+_YEAR = timedelta(days=365)
+
+# Commit date formats; only the ISO one accepts a T (strptime ignores case)
+# and only the date-only one accepts no colon, so one of them is ever tried
+_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+_ISO_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+_DATE_FORMAT = '%Y-%m-%d'
+
+# Dates in exactly one of those layouts, which datetime.fromisoformat parses the same way
+_CANONICAL_DATE = re.compile(r'\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}:\d{2})?', re.ASCII)
+
 class SustainabilityAnalyzer:
     def __init__(self, config: AnalysisConfig):
         self.config = config
-        self.sustainability_patterns = self._initialize_sustainability_patterns()
+        self.sustainability_patterns = _SUSTAINABILITY_PATTERNS
+        self._compiled_patterns, self._indicator_checks = _COMPILED_PATTERNS
+        
+    @staticmethod
+    def _compile_sustainability_patterns(
+        sustainability_patterns: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, Dict[str, re.Pattern]], Dict[str, List[tuple]]]:
+        """Compile the patterns and derive the per-group indicator checks."""
+        # Compile the patterns once rather than on every commit message; they run
+        # on lower-cased messages, where case-insensitive matching is wasted work
+        compiled_patterns = {
+            group: {category: re.compile(SustainabilityAnalyzer._strip_case_insensitive_flag(pattern))
+                    for category, pattern in patterns.items()}
+            for group, patterns in sustainability_patterns.items()
+        }
         
-    def _initialize_sustainability_patterns(self) -> Dict[str, Dict[str, Any]]:
+        # Per group, (category, keywords, pattern) checks; patterns that are plain
+        # word alternations are tested with substring checks instead of the regex
+        indicator_checks = {
+            group: [(category, SustainabilityAnalyzer._alternation_keywords(pattern), pattern)
+                    for category, pattern in patterns.items()]
+            for group, patterns in compiled_patterns.items()
+        }
+        return compiled_patterns, indicator_checks
+    
+
+    @staticmethod
+    def _initialize_sustainability_patterns() -> Dict[str, Dict[str, Any]]:
         """Initialize patterns for sustainability analysis."""
         return {
             'maintenance_indicators': {
@@ -41,21 +95,41 @@ class SustainabilityAnalyzer:
             }
         }
     
+    @staticmethod
+    def _strip_case_insensitive_flag(pattern: str) -> str:
+        """Drop a leading (?i) from a pattern that only ever sees lower-case text."""
+        if pattern.startswith(_CASE_INSENSITIVE_FLAG):
+            return pattern[len(_CASE_INSENSITIVE_FLAG):]
+        return pattern
+    
+    @staticmethod
+    def _alternation_keywords(pattern: re.Pattern) -> Optional[Tuple[str, ...]]:
+        """Return the words of a pattern that only matches one of several literal words."""
+        match = _KEYWORD_ALTERNATION.fullmatch(pattern.pattern)
+        return tuple(match.group(1).split('|')) if match else None
+    
     def analyze(self, commit_history: List[Dict[str, Any]], repo_info: RepositoryInfo, source_files: List[Path]) -> SustainabilityMetrics:
         """Perform comprehensive sustainability analysis."""
         print(f"♻️  Advanced sustainability analysis on {len(commit_history)} commits...")
         
+        # Parse every commit date once for all the analyses below, and measure
+        # every time window from the same instant
+        commits_with_dates = self._parse_commit_dates(commit_history)
+        now = datetime.now()
+        
         # Analyze commit patterns and activity
-        activity_analysis = self._analyze_activity_patterns(commit_history)
+        activity_analysis = self._analyze_activity_patterns(commit_history, commits_with_dates, now)
         
         # Analyze contributor diversity and bus factor
-        contributor_analysis = self._analyze_contributor_patterns(commit_history)
+        contributor_analysis = self._analyze_contributor_patterns(commit_history, commits_with_dates, now)
         
         # Analyze maintenance patterns
         maintenance_analysis = self._analyze_maintenance_patterns(commit_history, source_files)
         
-        # Analyze project health indicators
-        health_analysis = self._analyze_health_indicators(commit_history, repo_info)
+        # Analyze project health indicators, reusing the release count from the message scan
+        health_analysis = self._analyze_health_indicators(
+            commit_history, repo_info, commits_with_dates, maintenance_analysis['release_commits'], now
+        )
         
         # Calculate comprehensive sustainability metrics
         metrics = self._calculate_sustainability_metrics(
@@ -79,43 +153,42 @@ class SustainabilityAnalyzer:
             commit_frequency_score=round(metrics['commit_frequency_score'], 1)
         )
     
-    def _analyze_activity_patterns(self, commit_history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _parse_commit_dates(self, commit_history: List[Dict[str, Any]]) -> List[Tuple[datetime, Dict[str, Any]]]:
+        """Pair each commit that has a parseable date with that date, sorted by date."""
+        commits_with_dates = []
+        for commit in commit_history:
+            date_str = commit.get('date')
+            if isinstance(date_str, str):
+                date_obj = self._parse_date(date_str)
+                if date_obj:
+                    commits_with_dates.append((date_obj, commit))
+        
+        commits_with_dates.sort(key=lambda x: x[0])
+        return commits_with_dates
+    
+    def _analyze_activity_patterns(self, commit_history: List[Dict[str, Any]],
+                                   commits_with_dates: Optional[List[Tuple[datetime, Dict[str, Any]]]] = None,
+                                   now: Optional[datetime] = None) -> Dict[str, Any]:
         """Analyze commit activity patterns over time."""
         if not commit_history:
             return self._empty_activity_analysis()
         
-        # Parse commit dates and sort
-        commits_with_dates = []
-        for commit in commit_history:
-            try:
-                if 'date' in commit:
-                    date_str = commit['date']
-                    if isinstance(date_str, str):
-                        for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']:
-                            try:
-                                date_obj = datetime.strptime(date_str.split('+')[0].split('Z')[0], fmt)
-                                commits_with_dates.append((date_obj, commit))
-                                break
-                            except ValueError:
-                                continue
-            except Exception:
-                continue
-        
+        if commits_with_dates is None:
+            commits_with_dates = self._parse_commit_dates(commit_history)
         if not commits_with_dates:
             return self._empty_activity_analysis()
         
-        commits_with_dates.sort(key=lambda x: x[0])
-        
         # Calculate time-based metrics
-        now = datetime.now()
-        thirty_days_ago = now - timedelta(days=30)
-        ninety_days_ago = now - timedelta(days=90)
-        one_year_ago = now - timedelta(days=365)
+        now = now or datetime.now()
+        thirty_days_ago = now - _MONTH
+        ninety_days_ago = now - _QUARTER
+        one_year_ago = now - _YEAR
         
-        # Count commits by time periods
-        recent_commits = len([c for date, c in commits_with_dates if date >= thirty_days_ago])
-        quarterly_commits = len([c for date, c in commits_with_dates if date >= ninety_days_ago])
-        yearly_commits = len([c for date, c in commits_with_dates if date >= one_year_ago])
+        # Count commits by time periods; dates are sorted, so each count is a binary search
+        dates = [date for date, _ in commits_with_dates]
+        recent_commits = len(dates) - bisect_left(dates, thirty_days_ago)
+        quarterly_commits = len(dates) - bisect_left(dates, ninety_days_ago)
+        yearly_commits = len(dates) - bisect_left(dates, one_year_ago)
         
         # Calculate commit frequency trends
         if len(commits_with_dates) >= 2:
@@ -132,13 +205,12 @@ class SustainabilityAnalyzer:
             avg_commits_per_month = 0
         
         # Analyze activity trend
-        activity_trend = self._calculate_activity_trend(commits_with_dates)
+        activity_trend = self._calculate_activity_trend(commits_with_dates, now)
         
-        # Calculate activity distribution
-        activity_by_month: Dict[str, int] = defaultdict(int)
-        for date, commit in commits_with_dates:
-            month_key = f"{date.year}-{date.month:02d}"
-            activity_by_month[month_key] += 1
+        # Calculate activity distribution; commits are counted per (year, month)
+        # and each month key is formatted once rather than once per commit
+        commits_by_month = Counter((date.year, date.month) for date, _ in commits_with_dates)
+        activity_by_month = {f"{year}-{month:02d}": count for (year, month), count in commits_by_month.items()}
         
         return {
             'total_commits': len(commit_history),
@@ -147,42 +219,30 @@ class SustainabilityAnalyzer:
             'recent_commits_1y': yearly_commits,
             'avg_commits_per_month': avg_commits_per_month,
             'activity_trend': activity_trend,
-            'activity_distribution': dict(activity_by_month),
+            'activity_distribution': activity_by_month,
             'last_commit_date': commits_with_dates[-1][0] if commits_with_dates else None,
             'first_commit_date': commits_with_dates[0][0] if commits_with_dates else None
         }
     
-    def _analyze_contributor_patterns(self, commit_history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_contributor_patterns(self, commit_history: List[Dict[str, Any]],
+                                      commits_with_dates: Optional[List[Tuple[datetime, Dict[str, Any]]]] = None,
+                                      now: Optional[datetime] = None) -> Dict[str, Any]:
         """Analyze contributor diversity and bus factor."""
         if not commit_history:
             return self._empty_contributor_analysis()
         
         # Extract contributors
-        contributors: Dict[str, int] = defaultdict(int)
-        contributor_last_commit: Dict[str, Any] = {}
+        contributors: Counter[str] = Counter(commit.get('author', 'Unknown') for commit in commit_history)
         
-        for commit in commit_history:
-            author = commit.get('author', 'Unknown')
-            contributors[author] += 1
-            
-            # Track last commit date for each contributor
-            if 'date' in commit:
-                try:
-                    date_str = commit['date']
-                    if isinstance(date_str, str):
-                        for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']:
-                            try:
-                                date_obj = datetime.strptime(date_str.split('+')[0].split('Z')[0], fmt)
-                                if author not in contributor_last_commit or date_obj > contributor_last_commit[author]:
-                                    contributor_last_commit[author] = date_obj
-                                break
-                            except ValueError:
-                                continue
-                except Exception:
-                    continue
+        # Track last commit date for each contributor; dates ascend, so the last one seen wins
+        if commits_with_dates is None:
+            commits_with_dates = self._parse_commit_dates(commit_history)
+        contributor_last_commit: Dict[str, Any] = {}
+        for date_obj, commit in commits_with_dates:
+            contributor_last_commit[commit.get('author', 'Unknown')] = date_obj
         
         # Calculate bus factor (contributors needed for 80% of commits)
-        sorted_contributors = sorted(contributors.items(), key=lambda x: x[1], reverse=True)
+        sorted_contributors = contributors.most_common()
         total_commits = sum(contributors.values())
         cumulative_commits = 0
         bus_factor = 0
@@ -198,8 +258,7 @@ class SustainabilityAnalyzer:
         top_contributor_ratio = sorted_contributors[0][1] / total_commits if sorted_contributors else 0
         
         # Active contributors (committed in last 90 days)
-        now = datetime.now()
-        ninety_days_ago = now - timedelta(days=90)
+        ninety_days_ago = (now or datetime.now()) - _QUARTER
         active_contributors = sum(1 for last_date in contributor_last_commit.values() 
                                 if last_date >= ninety_days_ago)
         
@@ -209,40 +268,52 @@ class SustainabilityAnalyzer:
             'active_contributors': active_contributors,
             'bus_factor': bus_factor,
             'top_contributor_ratio': top_contributor_ratio,
-            'contributor_distribution': dict(contributors)
+            'contributor_distribution': contributors
         }
     
     def _analyze_maintenance_patterns(self, commit_history: List[Dict[str, Any]], 
                                     source_files: List[Path]) -> Dict[str, Any]:
-        """Analyze maintenance and health patterns in commits."""
-        maintenance_indicators: Counter[str] = Counter()
-        health_indicators: Counter[str] = Counter()
-        risk_indicators: Counter[str] = Counter()
+        """Analyze maintenance and health patterns in commits.
+        
+        Release-like commits are counted in the same pass over the messages
+        for _analyze_health_indicators.
+        """
+        indicator_counts: Dict[str, Counter[str]] = {group: Counter() for group in self._indicator_checks}
+        release_commits = 0
         
         # Analyze commit messages
         for commit in commit_history:
-            message = commit.get('message', '').lower()
-            
-            # Check maintenance patterns
-            for category, pattern in self.sustainability_patterns['maintenance_indicators'].items():
-                if re.search(pattern, message):
-                    maintenance_indicators[category] += 1
-            
-            # Check health patterns
-            for category, pattern in self.sustainability_patterns['health_indicators'].items():
-                if re.search(pattern, message):
-                    health_indicators[category] += 1
+            raw_message = commit.get('message', '')
+            if _RELEASE_PATTERN.search(raw_message):
+                release_commits += 1
+            message = raw_message.lower()
+            if not message.isascii():
+                message = message.translate(_LOWER_CASE_EXTRAS)
             
-            # Check risk patterns
-            for category, pattern in self.sustainability_patterns['risk_indicators'].items():
-                if re.search(pattern, message):
-                    risk_indicators[category] += 1
+            # Check maintenance, health and risk patterns
+            for group, checks in self._indicator_checks.items():
+                counts = indicator_counts[group]
+                for category, keywords, pattern in checks:
+                    if keywords:
+                        for keyword in keywords:
+                            if keyword in message:
+                                counts[category] += 1
+                                break
+                    elif pattern.search(message):
+                        counts[category] += 1
+        
+        maintenance_indicators = indicator_counts['maintenance_indicators']
+        health_indicators = indicator_counts['health_indicators']
+        risk_indicators = indicator_counts['risk_indicators']
         
         # Calculate maintenance scores (normalize to 0-1 range)
-        total_commits = len(commit_history)
-        maintenance_ratio = min(1.0, sum(maintenance_indicators.values()) / max(total_commits, 1))
-        health_ratio = min(1.0, sum(health_indicators.values()) / max(total_commits, 1))
-        risk_ratio = min(1.0, sum(risk_indicators.values()) / max(total_commits, 1))
+        total_maintenance_commits = sum(maintenance_indicators.values())
+        total_health_commits = sum(health_indicators.values())
+        total_risk_commits = sum(risk_indicators.values())
+        commit_count = max(len(commit_history), 1)
+        maintenance_ratio = min(1.0, total_maintenance_commits / commit_count)
+        health_ratio = min(1.0, total_health_commits / commit_count)
+        risk_ratio = min(1.0, total_risk_commits / commit_count)
         
         return {
             'maintenance_indicators': dict(maintenance_indicators),
@@ -251,55 +322,44 @@ class SustainabilityAnalyzer:
             'maintenance_ratio': maintenance_ratio,
             'health_ratio': health_ratio,
             'risk_ratio': risk_ratio,
-            'total_maintenance_commits': sum(maintenance_indicators.values()),
-            'total_health_commits': sum(health_indicators.values()),
-            'total_risk_commits': sum(risk_indicators.values())
+            'total_maintenance_commits': total_maintenance_commits,
+            'total_health_commits': total_health_commits,
+            'total_risk_commits': total_risk_commits,
+            'release_commits': release_commits
         }
     
     def _analyze_health_indicators(self, commit_history: List[Dict[str, Any]], 
-                                 repo_info: RepositoryInfo) -> Dict[str, Any]:
+                                 repo_info: RepositoryInfo,
+                                 commits_with_dates: Optional[List[Tuple[datetime, Dict[str, Any]]]] = None,
+                                 release_commits: Optional[int] = None,
+                                 now: Optional[datetime] = None) -> Dict[str, Any]:
         """Analyze overall project health indicators."""
         
         # Calculate project age
-        if commit_history:
-            try:
-                dates = []
-                for commit in commit_history:
-                    date = self._parse_date(commit.get('date', ''))
-                    if date:
-                        dates.append(date)
-                
-                if dates:
-                    first_date = min(dates)
-                    last_date = max(dates)
-                    project_age_days = (last_date - first_date).days
-                    days_since_last_commit = (datetime.now() - last_date).days
-                else:
-                    project_age_days = 0
-                    days_since_last_commit = 999
-            except Exception:
-                project_age_days = 0
-                days_since_last_commit = 999
+        if commits_with_dates is None:
+            commits_with_dates = self._parse_commit_dates(commit_history)
+        if commits_with_dates:
+            first_date = commits_with_dates[0][0]
+            last_date = commits_with_dates[-1][0]
+            project_age_days = (last_date - first_date).days
+            days_since_last_commit = ((now or datetime.now()) - last_date).days
         else:
             project_age_days = 0
             days_since_last_commit = 999
         
         # Analyze release patterns
-        release_commits = []
-        for commit in commit_history:
-            message = commit.get('message', '')
-            if re.search(r'(?i)(release|version|tag|v\d+\.\d+)', message):
-                release_commits.append(commit)
+        if release_commits is None:
+            release_commits = sum(1 for commit in commit_history if _RELEASE_PATTERN.search(commit.get('message', '')))
         
         # Calculate health score components
         activity_health = min(10, len(commit_history) / 10)
         recency_health = max(0, 10 - days_since_last_commit / 30)
-        release_health = min(10, len(release_commits) * 2)
+        release_health = min(10, release_commits * 2)
         
         return {
             'project_age_days': project_age_days,
             'days_since_last_commit': days_since_last_commit,
-            'release_commits': len(release_commits),
+            'release_commits': release_commits,
             'activity_health': activity_health,
             'recency_health': recency_health,
             'release_health': release_health,
@@ -307,7 +367,8 @@ class SustainabilityAnalyzer:
             'is_maintained': days_since_last_commit < 180
         }
     
-    def _calculate_activity_trend(self, commits_with_dates: List[Tuple[datetime, Dict]]) -> str:
+    def _calculate_activity_trend(self, commits_with_dates: List[Tuple[datetime, Dict]],
+                                  now: Optional[datetime] = None) -> str:
         """Calculate activity trend based on commit history."""
         if len(commits_with_dates) < 2:
             return "insufficient_data"
@@ -318,27 +379,29 @@ class SustainabilityAnalyzer:
         # - 10 commits across 300 days = increasing/stable
         
         # Check for insufficient data case (very few commits very recent)
-        now = datetime.now()
+        now = now or datetime.now()
         if len(commits_with_dates) == 2:
-            # Check if both commits are within last 5 days
-            all_very_recent = all(date >= now - timedelta(days=5) for date, _ in commits_with_dates)
+            # Check if both commits are within last 5 days, i.e. the older one is
+            (first_date, _), (second_date, _) = commits_with_dates
+            all_very_recent = min(first_date, second_date) >= now - _VERY_RECENT
             if all_very_recent:
                 return "insufficient_data"
             else:
                 return "new_project"
         
-        # Split commits into recent and older periods
-        six_months_ago = now - timedelta(days=180)
+        # Split commits into recent and older periods; dates are sorted, so one
+        # binary search finds the split
+        six_months_ago = now - _HALF_YEAR
         
-        recent_commits = [c for date, c in commits_with_dates if date >= six_months_ago]
-        older_commits = [c for date, c in commits_with_dates if date < six_months_ago]
+        older_commits = bisect_left([date for date, _ in commits_with_dates], six_months_ago)
+        recent_commits = len(commits_with_dates) - older_commits
         
         if not older_commits:
             return "new_project"
         
         # Calculate commit rates
-        recent_rate = len(recent_commits) / 180
-        older_rate = len(older_commits) / max((six_months_ago - commits_with_dates[0][0]).days, 1)
+        recent_rate = recent_commits / 180
+        older_rate = older_commits / max((six_months_ago - commits_with_dates[0][0]).days, 1)
         
         if recent_rate > older_rate * 1.2:
             return "increasing"
@@ -348,19 +411,33 @@ class SustainabilityAnalyzer:
             return "stable"
     
     def _parse_date(self, date_str: str) -> Optional[datetime]:
-        """Parse date string with multiple format support."""
+        """Parse date string with multiple format support.
+        
+        Dates already in a canonical layout go through the C-level
+        fromisoformat; others are parsed with the one strptime format that
+        could match them, rather than probing each in turn.
+        """
         if not date_str:
             return None
         
-        formats = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']
-        
-        for fmt in formats:
+        date_str = date_str.split('+')[0].split('Z')[0]
+        if _CANONICAL_DATE.fullmatch(date_str):
             try:
-                return datetime.strptime(date_str.split('+')[0].split('Z')[0], fmt)
+                return datetime.fromisoformat(date_str)
             except ValueError:
-                continue
+                pass
+        
+        if 'T' in date_str or 't' in date_str:
+            fmt = _ISO_DATETIME_FORMAT
+        elif ':' in date_str:
+            fmt = _DATETIME_FORMAT
+        else:
+            fmt = _DATE_FORMAT
         
-        return None
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            return None
     
     def _calculate_sustainability_metrics(self, activity_analysis: Dict, contributor_analysis: Dict,
                                         maintenance_analysis: Dict, health_analysis: Dict,
@@ -446,3 +523,8 @@ class SustainabilityAnalyzer:
             'top_contributor_ratio': 0,
             'contributor_distribution': {}
         }
+
+
+# Patterns and their compiled forms are built once at import and shared by every analyzer
+_SUSTAINABILITY_PATTERNS = SustainabilityAnalyzer._initialize_sustainability_patterns()
+_COMPILED_PATTERNS = SustainabilityAnalyzer._compile_sustainability_patterns(_SUSTAINABILITY_PATTERNS)
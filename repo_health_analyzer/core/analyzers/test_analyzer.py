@@ -2,18 +2,125 @@
 
 import re
 import os
+from bisect import bisect_right
 from pathlib import Path
 from typing import List, Dict, Set, Tuple, Any, Optional
 from collections import defaultdict, Counter
 from ...models.simple_report import TestMetrics, AnalysisConfig
+from .parallel import map_files
+
+# The literal text a pattern's matches start with, after any leading ^\s* and
+# up to the first regex construct; a trailing quantifier makes its last character optional
+_LEADING_LITERAL = re.compile(r'\^?(?:\\s[*+])?((?:[^\\.^$*+?{}\[\]()|]|\\\W)*)([*?{]?)')
+
+# Languages by file extension, built once rather than on every lookup
+_EXTENSION_LANGUAGES = {
+    '.py': 'python',
+    '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
+    '.java': 'java',
+    '.cs': 'csharp',
+    '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp',
+    '.rb': 'ruby',
+    '.php': 'php',
+    '.go': 'go',
+    '.rs': 'rust'
+}
+
+# Coverage configuration files looked for in the test files' parent directories,
+# and their case-folded names for matching against directory listings
+_COVERAGE_FILES = (
+    '.coveragerc', 'coverage.cfg', '.coverage',
+    'jest.config.js', 'jest.config.json',
+    'karma.conf.js', 'nyc.config.js'
+)
+_COVERAGE_FILE_NAMES = frozenset(name.casefold() for name in _COVERAGE_FILES)
+
+# Framework patterns run on lower-cased content without IGNORECASE, which
+# defeats the engine's literal prefix scan; these characters match an ASCII
+# letter case-insensitively but lower() leaves them (dotless i, long s) or adds
+# a combining dot (dotted capital I), so they are folded by hand first
+_LOWER_CASE_EXTRAS = str.maketrans({'\u0131': 'i', '\u017f': 's', '\u0130': 'i'})
+
+# A leading inline flag group, which applies to every alternative of a pattern
+_INLINE_FLAGS = re.compile(r'\(\?[aiLmsux]+\)')
+
+# Regex metacharacters that end literal expansion of a file pattern
+_PATTERN_METACHARS = frozenset('.^$*+?{}[]|()')
+
 
 class TestCodeAnalyzer:
     def __init__(self, config: AnalysisConfig):
         self.config = config
-        self.test_patterns = self._initialize_test_patterns()
-        self.framework_patterns = self._initialize_framework_patterns()
+        self.test_patterns = _TEST_PATTERNS
+        self.framework_patterns = _FRAMEWORK_PATTERNS
+        (self._test_file_pattern, self._test_file_suffixes, self._test_file_segments,
+         self._residual_file_pattern, self._compiled_function_patterns,
+         self._compiled_assertion_patterns, self._compiled_framework_patterns,
+         self._scanned_languages) = _COMPILED_PATTERNS
+        
+    @staticmethod
+    def _compile_test_patterns(test_patterns: Dict[str, Dict[str, Any]],
+                               framework_patterns: Dict[str, Dict[str, str]]) -> tuple:
+        """Compile the test and framework patterns and derive the path checks."""
+        # Patterns are compiled once with the flags they are searched with
+        # One alternation of every language's file patterns, so each path is searched once
+        test_file_pattern = re.compile('|'.join(
+            f'(?:{pattern})'
+            for patterns in test_patterns['file_patterns'].values()
+            for pattern in patterns
+        ))
+        # File patterns made of literals and .* are expanded into string checks: plain
+        # suffixes for str.endswith, and literal segments grouped by their final suffix;
+        # the rest stay in a residual alternation
+        suffixes: List[str] = []
+        test_file_segments: Dict[str, List[Tuple[bool, Tuple[str, ...]]]] = defaultdict(list)
+        residual_patterns = []
+        for patterns in test_patterns['file_patterns'].values():
+            for pattern in patterns:
+                forms = TestCodeAnalyzer._expand_file_pattern(pattern)
+                if forms is None:
+                    residual_patterns.append(pattern)
+                    continue
+                for anchored, segments in forms:
+                    if not anchored and len(segments) == 1:
+                        suffixes.append(segments[0])
+                    else:
+                        test_file_segments[segments[-1]].append((anchored, segments[:-1]))
+        test_file_suffixes = tuple(dict.fromkeys(suffixes))
+        residual_file_pattern = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in residual_patterns)
+        ) if residual_patterns else None
+        compiled_function_patterns = {
+            language: [(TestCodeAnalyzer._function_pattern_category(pattern),
+                        TestCodeAnalyzer._required_literal(pattern),
+                        re.compile(pattern, re.MULTILINE))
+                       for pattern in patterns]
+            for language, patterns in test_patterns['function_patterns'].items()
+        }
+        compiled_assertion_patterns = {
+            language: [(TestCodeAnalyzer._required_literal(pattern), re.compile(pattern, re.MULTILINE))
+                       for pattern in patterns]
+            for language, patterns in test_patterns['assertion_patterns'].items()
+        }
+        # Each framework pattern is split into its alternatives, so every search has
+        # a literal prefix to scan for, and lower-cased to run on lower-cased content
+        compiled_framework_patterns = {
+            language: [(framework, tuple(
+                re.compile(TestCodeAnalyzer._lower_case_literals(alternative), re.MULTILINE)
+                for alternative in TestCodeAnalyzer._top_level_alternatives(pattern)
+            )) for framework, pattern in patterns.items()]
+            for language, patterns in framework_patterns.items()
+        }
+        # Languages with something to count or detect; other test files are not read
+        scanned_languages = frozenset(compiled_function_patterns).union(
+            compiled_assertion_patterns, compiled_framework_patterns
+        )
+        return (test_file_pattern, test_file_suffixes, test_file_segments, residual_file_pattern,
+                compiled_function_patterns, compiled_assertion_patterns, compiled_framework_patterns,
+                scanned_languages)
         
-    def _initialize_test_patterns(self) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    def _initialize_test_patterns() -> Dict[str, Dict[str, Any]]:
         """Initialize test file and function detection patterns."""
         return {
             'file_patterns': {
@@ -100,7 +207,8 @@ class TestCodeAnalyzer:
             }
         }
     
-    def _initialize_framework_patterns(self) -> Dict[str, Dict[str, str]]:
+    @staticmethod
+    def _initialize_framework_patterns() -> Dict[str, Dict[str, str]]:
         """Initialize test framework detection patterns."""
         return {
             'python': {
@@ -127,6 +235,151 @@ class TestCodeAnalyzer:
             }
         }
     
+    @staticmethod
+    def _function_pattern_category(pattern: str) -> str:
+        """Return the count a function pattern's matches are added to."""
+        if 'class' in pattern.lower():
+            return 'test_classes'
+        if any(keyword in pattern.lower() for keyword in ['before', 'after', 'setup', 'teardown', 'fixture']):
+            return 'setup_teardown'
+        return 'test_functions'
+    
+    @staticmethod
+    def _required_literal(pattern: str) -> str:
+        """Return text every match of a pattern contains, or '' if none is known."""
+        # Alternatives outside any group need not start with the same text
+        if len(TestCodeAnalyzer._top_level_alternatives(pattern)) > 1:
+            return ''
+        
+        match = _LEADING_LITERAL.match(pattern)
+        literal = match.group(1)
+        if match.group(2):
+            literal = re.sub(r'(?:\\\W|.)$', '', literal)
+        return re.sub(r'\\(\W)', r'\1', literal)
+    
+    @staticmethod
+    def _top_level_alternatives(pattern: str) -> List[str]:
+        """Split a pattern at the '|' characters outside groups and character classes."""
+        if _INLINE_FLAGS.match(pattern):
+            return [pattern]
+        alternatives = []
+        start = depth = 0
+        in_class = False
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char == '\\':
+                i += 2
+                continue
+            if in_class:
+                in_class = char != ']'
+            elif char == '[':
+                in_class = True
+                # A ']' right after the opening bracket, or after '^', is literal
+                if pattern[i + 1:i + 2] == '^':
+                    i += 1
+                if pattern[i + 1:i + 2] == ']':
+                    i += 1
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == '|' and depth == 0:
+                alternatives.append(pattern[start:i])
+                start = i + 1
+            i += 1
+        alternatives.append(pattern[start:])
+        return alternatives
+    
+    @staticmethod
+    def _lower_case_literals(pattern: str) -> str:
+        """Lower-case a pattern, leaving escape sequences such as \\S and \\W as they are."""
+        return re.sub(r'\\.|[^\\]+', lambda part: part.group() if part.group()[0] == '\\' else part.group().lower(),
+                      pattern, flags=re.DOTALL)
+    
+    def _lower_case_content(self, content: str) -> str:
+        """Lower-case content so that matching it equals case-insensitive matching."""
+        if content.isascii() or not any(char in content for char in '\u0131\u017f\u0130'):
+            return content.lower()
+        return content.translate(_LOWER_CASE_EXTRAS).lower()
+    
+    @staticmethod
+    def _expand_file_pattern(pattern: str) -> Optional[List[Tuple[bool, Tuple[str, ...]]]]:
+        """Expand an end-anchored file pattern into (anchored, segments) forms, or None.
+        
+        A form matches paths containing its literal segments in order with the
+        last one as a suffix, and the first as a prefix when anchored. Segments
+        are separated by .* in the pattern, and '?' makes one character optional.
+        """
+        if not pattern.endswith('$') or pattern.endswith('\\$'):
+            return None
+        anchored = pattern.startswith('^')
+        body = pattern[1 if anchored else 0:-1]
+        forms = [['']]
+        i = 0
+        while i < len(body):
+            if body.startswith('.*', i):
+                forms = [segments + [''] for segments in forms]
+                i += 2
+                continue
+            char = body[i]
+            if char == '\\':
+                if i + 1 == len(body) or body[i + 1].isalnum():
+                    return None  # Character classes such as \d
+                options = [body[i + 1]]
+                i += 2
+            elif char in _PATTERN_METACHARS:
+                return None
+            else:
+                options = [char]
+                i += 1
+            
+            if body[i:i + 1] == '?':
+                options.append('')
+                i += 1
+            forms = [segments[:-1] + [segments[-1] + option] for segments in forms for option in options]
+        
+        expanded = []
+        for segments in forms:
+            # A leading .* lifts the anchor; other empty segments add nothing
+            form_anchored = anchored and (len(segments) == 1 or segments[0] != '')
+            literal_segments = tuple(segment for segment in segments[:-1] if segment) + (segments[-1],)
+            expanded.append((form_anchored, literal_segments))
+        return expanded
+    
+    def _is_test_file_path(self, file_str: str) -> bool:
+        """Check a lower-cased path against all language test file patterns."""
+        if '\n' in file_str:
+            # '.' and '$' treat newlines specially, so only the regex is exact here
+            return bool(self._test_file_pattern.search(file_str))
+        if file_str.endswith(self._test_file_suffixes):
+            return True
+        for suffix, forms in self._test_file_segments.items():
+            if not file_str.endswith(suffix):
+                continue
+            end = len(file_str) - len(suffix)
+            for anchored, segments in forms:
+                if self._segments_in_order(file_str, anchored, segments, end):
+                    return True
+        return bool(self._residual_file_pattern and self._residual_file_pattern.search(file_str))
+    
+    def _segments_in_order(self, file_str: str, anchored: bool, segments: Tuple[str, ...], end: int) -> bool:
+        """Check that segments occur in order, without overlap, before position end."""
+        position = 0
+        if anchored:
+            if not segments:
+                return end == 0
+            if not file_str.startswith(segments[0], 0, end):
+                return False
+            position = len(segments[0])
+            segments = segments[1:]
+        for segment in segments:
+            found = file_str.find(segment, position, end)
+            if found == -1:
+                return False
+            position = found + len(segment)
+        return True
+    
     def analyze(self, source_files: List[Path]) -> TestMetrics:
         """Perform comprehensive test analysis."""
         print(f"🧪 Advanced test analysis on {len(source_files)} files...")
@@ -134,14 +387,15 @@ class TestCodeAnalyzer:
         # Separate test files from source files
         test_files, source_files_only = self._separate_test_files(source_files)
         
-        # Analyze test files
-        test_analysis = self._analyze_test_files(test_files)
+        # Analyze test files, detecting each file's frameworks while it is read
+        file_frameworks: Dict[Path, List[str]] = {}
+        test_analysis = self._analyze_test_files(test_files, file_frameworks)
         
         # Analyze test coverage patterns
         coverage_analysis = self._analyze_test_coverage(test_files, source_files_only)
         
         # Detect test frameworks
-        framework_analysis = self._detect_test_frameworks(test_files)
+        framework_analysis = self._detect_test_frameworks(test_files, file_frameworks)
         
         # Calculate comprehensive test metrics
         metrics = self._calculate_test_metrics(
@@ -171,69 +425,84 @@ class TestCodeAnalyzer:
         source_files = []
         
         for file_path in all_files:
-            is_test_file = False
-            file_str = str(file_path).lower()
-            
             # Check against all language patterns
-            for language, patterns in self.test_patterns['file_patterns'].items():
-                for pattern in patterns:
-                    if re.search(pattern, file_str):
-                        is_test_file = True
-                        break
-                if is_test_file:
-                    break
-            
-            if is_test_file:
+            if self._is_test_file_path(str(file_path).lower()):
                 test_files.append(file_path)
             else:
                 source_files.append(file_path)
         
         return test_files, source_files
     
-    def _analyze_test_files(self, test_files: List[Path]) -> Dict[str, Any]:
-        """Analyze test files for quality and coverage."""
+    def _analyze_test_files(self, test_files: List[Path],
+                            file_frameworks: Optional[Dict[Path, List[str]]] = None) -> Dict[str, Any]:
+        """Analyze test files for quality and coverage, storing the frameworks each readable file uses."""
         analysis: Dict[str, Any] = {
             'total_test_functions': 0,
             'total_assertions': 0,
             'test_classes': 0,
             'test_files_by_language': Counter(),
-            'test_function_lengths': [],
-            'assertion_density': [],
+            # Lengths and densities are only ever averaged, so running totals are kept
+            'test_function_length_total': 0.0,
+            'test_function_length_count': 0,
+            'assertion_density_total': 0.0,
+            'assertion_density_count': 0,
             'test_file_details': [],
             'setup_teardown_count': 0
         }
         
-        for test_file in test_files:
-            try:
-                file_analysis = self._analyze_single_test_file(test_file)
-                if file_analysis:
-                    # Aggregate metrics
-                    analysis['total_test_functions'] += file_analysis['test_functions']
-                    analysis['total_assertions'] += file_analysis['assertions']
-                    analysis['test_classes'] += file_analysis['test_classes']
-                    analysis['setup_teardown_count'] += file_analysis['setup_teardown']
-                    
-                    # Track by language
-                    analysis['test_files_by_language'][file_analysis['language']] += 1
-                    
-                    # Collect detailed metrics
-                    analysis['test_function_lengths'].extend(file_analysis['function_lengths'])
-                    analysis['assertion_density'].append(file_analysis['assertion_density'])
-                    analysis['test_file_details'].append(file_analysis)
-                    
-            except Exception as e:
-                print(f"  ⚠️  Error analyzing {test_file.name}: {str(e)[:50]}...")
-                continue
+        file_scans = map_files(self._scan_test_file, test_files, chunksize=32)
+        for test_file, (file_analysis, frameworks) in zip(test_files, file_scans):
+            if file_frameworks is not None and frameworks is not None:
+                file_frameworks[test_file] = frameworks
+            if file_analysis:
+                # Aggregate metrics
+                analysis['total_test_functions'] += file_analysis['test_functions']
+                analysis['total_assertions'] += file_analysis['assertions']
+                analysis['test_classes'] += file_analysis['test_classes']
+                analysis['setup_teardown_count'] += file_analysis['setup_teardown']
+                
+                # Track by language
+                analysis['test_files_by_language'][file_analysis['language']] += 1
+                
+                # Collect detailed metrics
+                analysis['test_function_length_total'] += sum(file_analysis['function_lengths'])
+                analysis['test_function_length_count'] += len(file_analysis['function_lengths'])
+                analysis['assertion_density_total'] += file_analysis['assertion_density']
+                analysis['assertion_density_count'] += 1
+                analysis['test_file_details'].append(file_analysis)
         
         return analysis
     
-    def _analyze_single_test_file(self, test_file: Path) -> Optional[Dict[str, Any]]:
-        """Analyze a single test file."""
+    def _scan_test_file(self, test_file: Path) -> Tuple[Optional[Dict[str, Any]], Optional[List[str]]]:
+        """Analyze one test file and detect its frameworks, which are None if it cannot be read."""
+        # No patterns would run on the file, so its counts would all be zero
+        if self._detect_language(test_file.suffix.lower()) not in self._scanned_languages:
+            return None, None
+        
         try:
-            with open(test_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            content = self._read_test_file(test_file)
         except Exception:
-            return None
+            return None, None
+        
+        try:
+            file_analysis = self._analyze_single_test_file(test_file, content)
+        except Exception as e:
+            print(f"  ⚠️  Error analyzing {test_file.name}: {str(e)[:50]}...")
+            file_analysis = None
+        return file_analysis, self._detect_file_frameworks(test_file, content)
+    
+    def _read_test_file(self, test_file: Path) -> str:
+        """Read a test file as text, dropping undecodable bytes."""
+        with open(test_file, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read()
+    
+    def _analyze_single_test_file(self, test_file: Path, content: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Analyze a single test file, reading it unless its content is given."""
+        if content is None:
+            try:
+                content = self._read_test_file(test_file)
+            except Exception:
+                return None
         
         if not content.strip():
             return None
@@ -242,13 +511,18 @@ class TestCodeAnalyzer:
         language = self._detect_language(test_file.suffix.lower())
         
         # Get patterns for this language
-        function_patterns = self.test_patterns['function_patterns'].get(language, [])
-        assertion_patterns = self.test_patterns['assertion_patterns'].get(language, [])
+        function_patterns = self._compiled_function_patterns.get(language, [])
+        assertion_patterns = self._compiled_assertion_patterns.get(language, [])
+        
+        # Non-blank lines: all lines but the empty and whitespace-only ones, counted
+        # without building a list of the stripped lines
+        lines = content.split('\n')
+        non_blank_lines = len(lines) - lines.count('') - sum(map(str.isspace, lines))
         
         analysis: Dict[str, Any] = {
             'file_path': str(test_file),
             'language': language,
-            'total_lines': len([line for line in content.split('\n') if line.strip()]),
+            'total_lines': non_blank_lines,
             'test_functions': 0,
             'test_classes': 0,
             'assertions': 0,
@@ -257,20 +531,16 @@ class TestCodeAnalyzer:
             'assertion_density': 0.0
         }
         
-        # Count test functions and classes
-        for pattern in function_patterns:
-            matches = re.findall(pattern, content, re.MULTILINE)
-            if 'class' in pattern.lower():
-                analysis['test_classes'] += len(matches)
-            elif any(keyword in pattern.lower() for keyword in ['before', 'after', 'setup', 'teardown', 'fixture']):
-                analysis['setup_teardown'] += len(matches)
-            else:
-                analysis['test_functions'] += len(matches)
+        # Count test functions and classes; a pattern whose literal text is missing
+        # from the file cannot match, so the file is not scanned for it
+        for category, literal, pattern in function_patterns:
+            if literal in content:
+                analysis[category] += len(pattern.findall(content))
         
         # Count assertions
-        for pattern in assertion_patterns:
-            matches = re.findall(pattern, content, re.MULTILINE)
-            analysis['assertions'] += len(matches)
+        for literal, pattern in assertion_patterns:
+            if literal in content:
+                analysis['assertions'] += len(pattern.findall(content))
         
         # Calculate assertion density
         if analysis['total_lines'] > 0:
@@ -294,37 +564,33 @@ class TestCodeAnalyzer:
         }
         
         # Check for coverage configuration files
-        coverage_files = [
-            '.coveragerc', 'coverage.cfg', '.coverage',
-            'jest.config.js', 'jest.config.json',
-            'karma.conf.js', 'nyc.config.js'
-        ]
-        
         if test_files:
             repo_root = test_files[0].parent
             while repo_root.parent != repo_root:
-                for coverage_file in coverage_files:
-                    if (repo_root / coverage_file).exists():
-                        coverage_analysis['has_coverage_config'] = True
-                        coverage_analysis['coverage_indicators'].append(coverage_file)
+                for coverage_file in self._find_coverage_files(repo_root):
+                    coverage_analysis['has_coverage_config'] = True
+                    coverage_analysis['coverage_indicators'].append(coverage_file)
                 repo_root = repo_root.parent
         
-        # Analyze test-to-source file mapping
+        # Analyze test-to-source file mapping; each test path is converted to a
+        # string once, rather than for every source it corresponds to, and sources
+        # sharing a stem (index, __init__, ...) are matched against the tests once
+        test_index = self._index_test_names(test_files)
+        test_paths = [str(test_file) for test_file in test_files]
+        tests_by_stem: Dict[str, List[str]] = {}
         test_source_pairs = 0
         for source_file in source_files:
-            source_name = source_file.stem
-            
             # Look for corresponding test files
-            corresponding_tests = []
-            for test_file in test_files:
-                test_name = test_file.stem
-                if (source_name in test_name.replace('test_', '').replace('_test', '') or
-                    test_name.replace('test_', '').replace('_test', '') in source_name):
-                    corresponding_tests.append(test_file)
-            
+            source_name = source_file.stem
+            if source_name not in tests_by_stem:
+                tests_by_stem[source_name] = [
+                    test_paths[index] for index in self._find_corresponding_tests(source_name, test_index)
+                ]
+            corresponding_tests = tests_by_stem[source_name]
+
             if corresponding_tests:
                 test_source_pairs += 1
-                coverage_analysis['test_to_source_mapping'][str(source_file)] = [str(t) for t in corresponding_tests]
+                coverage_analysis['test_to_source_mapping'][str(source_file)] = list(corresponding_tests)
             else:
                 coverage_analysis['potentially_uncovered_files'].append(str(source_file))
         
@@ -334,8 +600,66 @@ class TestCodeAnalyzer:
         
         return coverage_analysis
     
-    def _detect_test_frameworks(self, test_files: List[Path]) -> Dict[str, Any]:
-        """Detect test frameworks used in the project."""
+    def _find_coverage_files(self, directory: Path) -> List[str]:
+        """List the coverage configuration files that exist in a directory."""
+        # One listing per directory replaces a stat per file name; names in it are
+        # confirmed with exists(), which skips broken links and matches names the
+        # way the file system does (case-insensitively on some)
+        try:
+            listed = {entry.casefold() for entry in os.listdir(directory)} & _COVERAGE_FILE_NAMES
+        except OSError:
+            listed = _COVERAGE_FILE_NAMES
+        return [
+            name for name in _COVERAGE_FILES
+            if name.casefold() in listed and (directory / name).exists()
+        ]
+    
+    def _index_test_names(self, test_files: List[Path]) -> Tuple[str, List[int], Dict[str, List[int]], List[int]]:
+        """Index test names, without their test_/_test markers, for _find_corresponding_tests.
+        
+        Returns the names joined by NUL (which no file name contains), the offset
+        of each name in that string, the test positions holding each name, and
+        the distinct name lengths in ascending order.
+        """
+        test_names = [test_file.stem.replace('test_', '').replace('_test', '') for test_file in test_files]
+        name_offsets = []
+        offset = 0
+        tests_by_name: Dict[str, List[int]] = defaultdict(list)
+        for index, name in enumerate(test_names):
+            name_offsets.append(offset)
+            offset += len(name) + 1
+            tests_by_name[name].append(index)
+        return '\0'.join(test_names), name_offsets, tests_by_name, sorted({len(name) for name in tests_by_name})
+    
+    def _find_corresponding_tests(self, source_name: str,
+                                  test_index: Tuple[str, List[int], Dict[str, List[int]], List[int]]) -> List[int]:
+        """Return, in order, the positions of tests whose name contains or is contained in source_name."""
+        joined_names, name_offsets, tests_by_name, name_lengths = test_index
+        if not source_name:
+            return list(range(len(name_offsets)))
+        
+        matches = set()
+        # Test names containing the source name, found by one scan of all names
+        position = joined_names.find(source_name)
+        while position != -1:
+            index = bisect_right(name_offsets, position) - 1
+            matches.add(index)
+            if index + 1 == len(name_offsets):
+                break
+            position = joined_names.find(source_name, name_offsets[index + 1])
+        
+        # Test names contained in the source name, looked up by each substring
+        for length in name_lengths:
+            if length > len(source_name):
+                break
+            for start in range(len(source_name) - length + 1):
+                matches.update(tests_by_name.get(source_name[start:start + length], ()))
+        
+        return sorted(matches)
+    
+    def _detect_test_frameworks(self, test_files: List[Path],
+                                file_frameworks: Optional[Dict[Path, List[str]]] = None) -> Dict[str, Any]:
+        """Detect test frameworks used in the project, from each file's frameworks when given."""
         framework_analysis: Dict[str, Any] = {
             'detected_frameworks': [],
             'framework_files': defaultdict(list),
@@ -346,16 +670,17 @@ class TestCodeAnalyzer:
         
         for test_file in test_files:
             try:
-                with open(test_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+                # file_frameworks holds every test file that could be read
+                if file_frameworks is None:
+                    frameworks = self._detect_file_frameworks(test_file, self._read_test_file(test_file))
+                elif test_file in file_frameworks:
+                    frameworks = file_frameworks[test_file]
+                else:
+                    continue
                 
-                language = self._detect_language(test_file.suffix.lower())
-                framework_patterns = self.framework_patterns.get(language, {})
-                
-                for framework, pattern in framework_patterns.items():
-                    if re.search(pattern, content, re.MULTILINE | re.IGNORECASE):
-                        framework_indicators[framework] += 1
-                        framework_analysis['framework_files'][framework].append(str(test_file))
+                for framework in frameworks:
+                    framework_indicators[framework] += 1
+                    framework_analysis['framework_files'][framework].append(str(test_file))
                 
             except Exception:
                 continue
@@ -370,20 +695,21 @@ class TestCodeAnalyzer:
         
         return framework_analysis
     
+    def _detect_file_frameworks(self, test_file: Path, content: str) -> List[str]:
+        """List the frameworks whose patterns match a test file's content."""
+        language = self._detect_language(test_file.suffix.lower())
+        framework_patterns = self._compiled_framework_patterns.get(language)
+        if not framework_patterns:
+            return []
+        lowered = self._lower_case_content(content)
+        return [
+            framework for framework, alternatives in framework_patterns
+            if any(alternative.search(lowered) for alternative in alternatives)
+        ]
+    
     def _detect_language(self, file_extension: str) -> str:
         """Detect programming language from file extension."""
-        extension_map = {
-            '.py': 'python',
-            '.js': 'javascript', '.jsx': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
-            '.java': 'java',
-            '.cs': 'csharp',
-            '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp',
-            '.rb': 'ruby',
-            '.php': 'php',
-            '.go': 'go',
-            '.rs': 'rust'
-        }
-        return extension_map.get(file_extension, 'generic')
+        return _EXTENSION_LANGUAGES.get(file_extension, 'generic')
     
     def _calculate_test_metrics(self, test_analysis: Dict, coverage_analysis: Dict,
                               framework_analysis: Dict, test_file_count: int,
@@ -421,8 +747,8 @@ class TestCodeAnalyzer:
         ))
         
         # Adjust success rate based on test function lengths
-        if test_analysis.get('test_function_lengths'):
-            avg_test_length = sum(test_analysis['test_function_lengths']) / len(test_analysis['test_function_lengths'])
+        if test_analysis.get('test_function_length_count'):
+            avg_test_length = test_analysis['test_function_length_total'] / test_analysis['test_function_length_count']
             if avg_test_length > 50:  # Very long tests might be less reliable
                 success_rate *= 0.9
             elif avg_test_length < 5:  # Very short tests might be incomplete
@@ -435,4 +761,10 @@ class TestCodeAnalyzer:
             'has_coverage_indicators': coverage_analysis.get('has_coverage_config', False) or len(coverage_analysis.get('coverage_indicators', [])) > 0,
             'estimated_coverage': coverage_analysis.get('estimated_coverage_percentage', 0.0),
             'potentially_uncovered_files': coverage_analysis.get('potentially_uncovered_files', [])
-        }
\ No newline at end of file
+        }
+
+
+# Patterns and their compiled forms are built once at import and shared by every analyzer
+_TEST_PATTERNS = TestCodeAnalyzer._initialize_test_patterns()
+_FRAMEWORK_PATTERNS = TestCodeAnalyzer._initialize_framework_patterns()
+_COMPILED_PATTERNS = TestCodeAnalyzer._compile_test_patterns(_TEST_PATTERNS, _FRAMEWORK_PATTERNS)
@@ -3,7 +3,7 @@
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
-from repo_health_analyzer.core.analyzers.code_quality_analyzer import CodeQualityAnalyzer
+from repo_health_analyzer.core.analyzers.code_quality_analyzer import CodeQualityAnalyzer, FileMetrics
 from repo_health_analyzer.models.simple_report import AnalysisConfig
 
 
@@ -239,18 +239,37 @@ def risky_function():
         test_file = Path('test.py')
         result = analyzer._analyze_file_comprehensive(test_file)
         
-        assert result is not None
-        assert 'language' in result
-        assert 'complexity' in result
-        assert 'function_lengths' in result
-        assert result['language'] == 'python'
+        assert isinstance(result, FileMetrics)
+        assert result.language == 'python'
+        assert isinstance(result.complexity, list)
+        assert isinstance(result.function_lengths, list)
+    
+    @patch('builtins.open', mock_open(read_data='# TODO: one\n# todo two\nmastodon = 1\n'))
+    def test_analyze_file_comprehensive_todo_count(self, analyzer):
+        """Test case-insensitive, whole-word TODO counting."""
+        result = analyzer._analyze_file_comprehensive(Path('todo.py'))
+        assert result.todo_count == 2
     
     @patch('builtins.open', side_effect=IOError())
     def test_analyze_file_comprehensive_error(self, mock_open, analyzer):
         """Test file analysis with IO error."""
         test_file = Path('nonexistent.py')
         result = analyzer._analyze_file_comprehensive(test_file)
-        assert result == {}
+        assert result is None
+    
+    def test_bin_complexity_distribution(self, analyzer):
+        """Test complexity bucketing boundaries."""
+        distribution = analyzer._bin_complexity_distribution([1, 3, 4, 6, 7, 10, 11, 15, 16, 40])
+        
+        assert distribution == {
+            'simple': 2,
+            'moderate': 2,
+            'complex': 2,
+            'very_complex': 2,
+            'extremely_complex': 2
+        }
+        assert analyzer._bin_complexity_distribution([]) == {}
+        assert analyzer._bin_complexity_distribution([2, 2]) == {'simple': 2}
     
     def test_calculate_comprehensive_scores(self, analyzer):
         """Test comprehensive score calculation."""
@@ -286,6 +305,17 @@ def risky_function():
             assert hasattr(result, 'comment_density')
             assert 0 <= result.overall_score <= 10
     
+    def test_analyze_skips_empty_files(self, analyzer, tmp_path, sample_python_code):
+        """Test that skipped files do not leave placeholder values in the per-file series."""
+        (tmp_path / 'empty.py').write_text('')
+        (tmp_path / 'module.py').write_text(sample_python_code)
+        
+        result = analyzer.analyze([tmp_path / 'empty.py', tmp_path / 'module.py'])
+        single = analyzer.analyze([tmp_path / 'module.py'])
+        
+        assert result.comment_density == single.comment_density
+        assert result.naming_consistency == single.naming_consistency
+    
     def test_empty_file_list(self, analyzer):
         """Test analysis with empty file list."""
         result = analyzer.analyze([])
@@ -305,8 +335,10 @@ def risky_function():
     def test_generate_quality_insights(self, analyzer):
         """Test quality insights generation."""
         file_details = [
-            {'complexity': [1, 2, 20], 'file_path': 'test1.py'},
-            {'complexity': [3, 4], 'file_path': 'test2.py'}
+            FileMetrics(file_path='test1.py', language='python', total_lines=10,
+                        complexity=[1, 2, 20], function_lengths=[]),
+            FileMetrics(file_path='test2.py', language='python', total_lines=10,
+                        complexity=[3, 4], function_lengths=[])
         ]
         metrics_summary = {
             'avg_complexity': 6.0,
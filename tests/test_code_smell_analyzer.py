@@ -3,7 +3,7 @@
 import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
-from repo_health_analyzer.core.analyzers.code_smell_analyzer import CodeSmellAnalyzer
+from repo_health_analyzer.core.analyzers.code_smell_analyzer import CodeSmellAnalyzer, Smell
 from repo_health_analyzer.models.simple_report import AnalysisConfig
 
 
@@ -206,19 +206,58 @@ def update_product(product_id, name, description, price, category, brand,
             assert 'context' in dup
             assert dup['occurrences'] > 1
     
+    def test_find_duplicate_blocks_rk(self, analyzer):
+        """Test rolling-hash detection of repeated multi-line blocks."""
+        block = [
+            'total = 0',
+            'for item in items:',
+            '    if item.price > 0:',
+            '        total += item.price * item.quantity',
+            '    else:',
+            '        log_invalid(item)',
+        ]
+        lines = ['def first(items):'] + ['    ' + line for line in block] + ['    return total', '']
+        lines += ['def second(items):'] + ['    ' + line for line in block] + ['    return -total']
+        
+        duplicates = analyzer._find_duplicate_blocks_rk(lines)
+        
+        assert len(duplicates) == 1
+        assert duplicates[0]['line'] == 2
+        assert duplicates[0]['occurrences'] == 2
+        assert 'for item in items:' in duplicates[0]['context']
+        
+        assert analyzer._find_duplicate_blocks_rk(['x = 1'] * 3) == []
+    
+    def test_find_duplicate_blocks_rk_linear_on_repetitive_input(self, analyzer):
+        """Test that highly repetitive content is handled quickly and reported once."""
+        lines = ['value = compute_something_quite_long(argument_one, argument_two)'] * 5000
+        
+        duplicates = analyzer._find_duplicate_blocks_rk(lines)
+        
+        assert len(duplicates) == 1
+        assert duplicates[0]['occurrences'] == 5000 - 6 + 1
+    
     def test_extract_context(self, analyzer):
         """Test context extraction around specific lines."""
-        lines = [
-            "line 1",
-            "line 2", 
-            "target line",
-            "line 4",
-            "line 5"
-        ]
-        context = analyzer._extract_context(lines, 3, context_size=1)
-        assert "line 2" in context
-        assert "target line" in context
-        assert "line 4" in context
+        content = "line 1\nline 2\ntarget line\nline 4\nline 5"
+        line_starts = analyzer._line_starts(content)
+        context = analyzer._extract_context(content, line_starts, 3, context_size=1)
+        assert context == "line 2 | target line | line 4"
+        
+        # Windows are clipped at the start and end of the file
+        assert analyzer._extract_context(content, line_starts, 1) == "line 1 | line 2 | target line"
+        assert analyzer._extract_context(content, line_starts, 5) == "target line | line 4 | line 5"
+    
+    def test_line_starts(self, analyzer):
+        """Test line start offsets used for match line numbers."""
+        from bisect import bisect_right
+        
+        content = 'a = 1\nb = 22\n\nc = 333'
+        line_starts = analyzer._line_starts(content)
+        
+        assert line_starts == [0, 6, 13, 14]
+        for pos in range(len(content)):
+            assert bisect_right(line_starts, pos) == content[:pos].count('\n') + 1
     
     def test_get_smell_suggestion(self, analyzer):
         """Test refactoring suggestion retrieval."""
@@ -234,13 +273,18 @@ def update_product(product_id, name, description, price, category, brand,
     def test_calculate_file_smell_score(self, analyzer):
         """Test file smell score calculation."""
         smells = [
-            {'severity': 'high', 'type': 'long_method'},
-            {'severity': 'medium', 'type': 'duplicate_code'},
-            {'severity': 'low', 'type': 'magic_numbers'}
+            Smell('long_method', 'high', 'a.py', 1, 'Long method'),
+            Smell('duplicate_code', 'medium', 'a.py', 2, 'Duplicate code'),
+            Smell('magic_numbers', 'low', 'a.py', 3, 'Magic number')
         ]
         
         score = analyzer._calculate_file_smell_score(smells)
-        assert score > 0
+        assert score == 3.0 + 2.0 + 1.0
+        
+        # Unknown severities weigh like 'low'
+        assert analyzer._calculate_file_smell_score(
+            [Smell('custom', 'unknown', 'a.py', 1, 'Custom smell')]
+        ) == 1.0
         
         # Test empty smells
         empty_score = analyzer._calculate_file_smell_score([])
@@ -259,6 +303,7 @@ def update_product(product_id, name, description, price, category, brand,
         
         score = analyzer._calculate_severity_score(severity_distribution)
         assert 0 <= score <= 10
+        assert score == pytest.approx(10 - (2 * 4 + 3 * 3 + 5 * 2 + 10 * 1) / (20 * 4.0) * 10)
         
         # Test empty distribution
         empty_score = analyzer._calculate_severity_score(Counter())
@@ -271,7 +316,7 @@ def update_product(product_id, name, description, price, category, brand,
             test_file = Path('test.py')
             smells = analyzer._analyze_file_smells(test_file)
             
-            smell_types = [smell['type'] for smell in smells]
+            smell_types = [smell.type for smell in smells]
             assert 'long_method' in smell_types
     
     @patch('builtins.open', mock_open())
@@ -281,7 +326,7 @@ def update_product(product_id, name, description, price, category, brand,
             test_file = Path('test.py')
             smells = analyzer._analyze_file_smells(test_file)
             
-            smell_types = [smell['type'] for smell in smells]
+            smell_types = [smell.type for smell in smells]
             assert 'duplicate_code' in smell_types
     
     @patch('builtins.open', mock_open())
@@ -291,7 +336,7 @@ def update_product(product_id, name, description, price, category, brand,
             test_file = Path('test.py')
             smells = analyzer._analyze_file_smells(test_file)
             
-            smell_types = [smell['type'] for smell in smells]
+            smell_types = [smell.type for smell in smells]
             assert 'large_class' in smell_types
     
     @patch('builtins.open', mock_open())
@@ -301,7 +346,7 @@ def update_product(product_id, name, description, price, category, brand,
             test_file = Path('test.py')
             smells = analyzer._analyze_file_smells(test_file)
             
-            smell_types = [smell['type'] for smell in smells]
+            smell_types = [smell.type for smell in smells]
             assert 'magic_numbers' in smell_types
     
     @patch('builtins.open', mock_open())
@@ -311,7 +356,7 @@ def update_product(product_id, name, description, price, category, brand,
             test_file = Path('test.py')
             smells = analyzer._analyze_file_smells(test_file)
             
-            smell_types = [smell['type'] for smell in smells]
+            smell_types = [smell.type for smell in smells]
             assert 'feature_envy' in smell_types
     
     @patch('builtins.open', mock_open())
@@ -321,7 +366,7 @@ def update_product(product_id, name, description, price, category, brand,
             test_file = Path('test.py')
             smells = analyzer._analyze_file_smells(test_file)
             
-            smell_types = [smell['type'] for smell in smells]
+            smell_types = [smell.type for smell in smells]
             assert 'long_parameter_list' in smell_types
     
     @patch('builtins.open', side_effect=IOError())
@@ -396,6 +441,114 @@ def update_product(product_id, name, description, price, category, brand,
             assert isinstance(result.hotspot_files, list)
             assert isinstance(result.smells, list)
     
+    def test_analyze_file_smells_fast_large_file(self, analyzer, tmp_path):
+        """Test that files above the old 100KB cap are still analyzed."""
+        large_file = tmp_path / 'large.py'
+        large_file.write_text('x = 1\n' * 20000 + 'def f():\n' + '    y = 1\n' * 40 + 'z = 99\n')
+        
+        smells = analyzer._analyze_file_smells_fast(large_file)
+        
+        assert Smell('long_method', 'medium', str(large_file), 20001,
+                     'Method has 40 lines (>30)') in smells
+        assert any(smell.type == 'magic_number' and smell.line == 20042 for smell in smells)
+        
+        result = analyzer.analyze([large_file])
+        assert result.total_count > 0
+        assert result.smells[0] == {
+            'type': 'long_method', 'severity': 'medium', 'file': str(large_file), 'line': 20001,
+            'description': 'Method has 40 lines (>30)', 'context': '', 'suggestion': ''
+        }
+    
+    def test_scan_line_structure(self, analyzer, tmp_path):
+        """Test method extents and long lines found by the array-based line scan."""
+        import mmap
+
+        source = tmp_path / 'structure.py'
+        source.write_text(
+            'def short():\n' + '    pass\n' * 5 +
+            'def capped():\n' + '    x = 1\n' * 60 +
+            'def ended():\n' + '    y = 2\n' * 35 + '\x0c\n' + 'z = 3\n' +
+            'def trailing():\n' + ('    w = "' + 'a' * 130 + '"\n') * 32
+        )
+
+        with open(source, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            line_starts, long_methods, long_lines = analyzer._scan_line_structure(content)
+
+        assert len(line_starts) == 6 + 61 + 38 + 33 + 1
+        # capped stops counting at 50 lines; ended runs until the unindented 'z = 3'
+        # (the form-feed line is blank); trailing runs to the end of the file
+        assert long_methods == [(6, 50), (67, 36), (105, 33)]
+        assert long_lines == [(i, 140) for i in range(106, 138)]
+
+    def test_analyze_file_smells_fast_empty_file(self, analyzer, tmp_path):
+        """Test fast analysis of empty and whitespace-only files."""
+        empty_file = tmp_path / 'empty.py'
+        empty_file.write_text('')
+        blank_file = tmp_path / 'blank.py'
+        blank_file.write_text('\n   \n')
+        
+        assert analyzer._analyze_file_smells_fast(empty_file) == []
+        assert analyzer._analyze_file_smells_fast(blank_file) == []
+
+        # Characters str.strip() removes, ASCII or not, leave a file blank
+        control_blank_file = tmp_path / 'control_blank.py'
+        control_blank_file.write_text('\x1c' * 130 + '\n')
+        unicode_blank_file = tmp_path / 'unicode_blank.py'
+        unicode_blank_file.write_text('\xa0' * 130 + '\n', encoding='utf-8')
+        assert analyzer._analyze_file_smells_fast(control_blank_file) == []
+        assert analyzer._analyze_file_smells_fast(unicode_blank_file) == []
+
+    def test_analyze_file_smells_fast_line_endings(self, analyzer, tmp_path):
+        """Test that CRLF and lone CR end lines as they do in text mode."""
+        crlf_file = tmp_path / 'crlf.py'
+        crlf_file.write_bytes(b'x' * 120 + b'\r\n' + b'y' * 121 + b'\r\n')
+        cr_file = tmp_path / 'cr.py'
+        cr_file.write_bytes(b'def f():\r' + b'    y = 1\r' * 40 + b'z = 1\r')
+
+        assert analyzer._analyze_file_smells_fast(crlf_file) == [
+            Smell('long_line', 'low', str(crlf_file), 2, 'Line length: 121 characters (>120)')
+        ]
+        assert analyzer._analyze_file_smells_fast(cr_file) == [
+            Smell('long_method', 'medium', str(cr_file), 1, 'Method has 40 lines (>30)')
+        ]
+
+    def test_analyze_file_smells_fast_unicode_blank_lines(self, analyzer, tmp_path):
+        """Test that lines str.strip() empties do not end a method."""
+        source = tmp_path / 'blank_lines.py'
+        source.write_text(
+            'def f():\n' + '    y = 1\n' * 20 + '\xa0\n\x1c\n' + '    y = 2\n' * 20 + 'z = 1\n',
+            encoding='utf-8'
+        )
+
+        assert analyzer._analyze_file_smells_fast(source) == [
+            Smell('long_method', 'medium', str(source), 1, 'Method has 42 lines (>30)')
+        ]
+
+    def test_analyze_file_smells_fast_non_ascii(self, analyzer, tmp_path):
+        """Test that non-ASCII files are searched as decoded text."""
+        source = tmp_path / 'unicode.py'
+        source.write_bytes('x = "é12"\r\ny = "'.encode('utf-8') + b'a' * 120 + '"\r\nz = ١٢٣\n'.encode('utf-8'))
+
+        # 'é12' is one word, Arabic-Indic digits are digits, and CRLF ends lines
+        assert analyzer._analyze_file_smells_fast(source) == [
+            Smell('long_line', 'low', str(source), 2, 'Line length: 126 characters (>120)'),
+            Smell('magic_number', 'low', str(source), 3, 'Magic number: ١٢٣'),
+        ]
+    
+    def test_analyze_caps_reported_smells(self, analyzer, tmp_path):
+        """Test that only 50 smells are kept while the totals count all of them."""
+        files = []
+        for i in range(8):
+            file_path = tmp_path / f'numbers_{i}.py'
+            file_path.write_text('\n'.join(f'x{j} = {j + 100}' for j in range(10)))
+            files.append(file_path)
+
+        result = analyzer.analyze(files)
+
+        assert result.total_count == 80
+        assert result.smells_by_type == {'magic_number': 80}
+        assert len(result.smells) == 50
+
     def test_empty_file_list(self, analyzer):
         """Test analysis with empty file list."""
         result = analyzer.analyze([])
@@ -427,7 +580,7 @@ class DataProcessor {
             smells = analyzer._analyze_file_smells(test_file)
             
             assert len(smells) > 0
-            smell_types = [smell['type'] for smell in smells]
+            smell_types = [smell.type for smell in smells]
             # Should detect some smells in JavaScript code
             assert len(smell_types) > 0
     
@@ -444,6 +597,67 @@ class DataProcessor {
         assert 'medium' in severities
         assert 'low' in severities
     
+    def test_smell_patterns_precompiled_with_literals(self, analyzer):
+        """Test that every smell pattern carries its compiled regex and literal pre-check."""
+        for config in analyzer.smell_patterns.values():
+            if config['pattern'] is not None:
+                assert config['compiled'].pattern == config['pattern']
+            assert isinstance(config['required_literals'], tuple)
+    
+    def test_required_literals_skip_pattern(self, analyzer):
+        """Test that a pattern is not run when none of its required literals are present."""
+        content = 'def check(value):\n    if value == 1:\n        return 1\n    return 0\n'
+        with patch('builtins.open', mock_open(read_data=content)):
+            with patch.dict(analyzer.smell_patterns['switch_statements'], {'compiled': Mock()}) as config:
+                smells = analyzer._analyze_file_smells(Path('test.py'))
+                config['compiled'].finditer.assert_not_called()
+        
+        assert 'switch_statements' not in [smell.type for smell in smells]
+    
+    def test_standard_pattern_stops_after_first_matches(self, analyzer):
+        """Test that a standard pattern is not scanned past its threshold and first five matches."""
+        import re
+
+        content = ''.join(f'x = {i}  # TODO fix\n' for i in range(100))
+        match_iter = iter(list(re.finditer('# TODO', content)))
+        compiled = Mock()
+        compiled.finditer.return_value = match_iter
+        with patch('builtins.open', mock_open(read_data=content)):
+            with patch.dict(analyzer.smell_patterns['comments'], {'compiled': compiled}):
+                smells = analyzer._analyze_file_smells(Path('test.py'))
+
+        assert [smell.line for smell in smells if smell.type == 'comments'] == [1, 2, 3, 4, 5]
+        assert len(list(match_iter)) == 95
+
+    def test_fused_pattern_matches_individual_patterns(self, analyzer, magic_numbers_code, feature_envy_code):
+        """Test that the fused token-level scan finds what the individual patterns find."""
+        from collections import Counter
+        
+        # Token-level smells whose matches overlap when they share a line
+        overlapping = [
+            'x = self.a.b.c.d', 'y = self._a.b.c', 'v = self.a.b.12', 'def f(a=10, b, c, d, e):',
+            'def f(x=self.a.b.c, y, z, w):', 'q = x._12 + 10._y + a._b99 + 12._x + obj._a + 10',
+        ]
+        for content in [magic_numbers_code, feature_envy_code] + overlapping:
+            fused_counts = Counter(m.lastgroup for m in analyzer._fused_pattern.finditer(content))
+            for smell_type in analyzer._FUSED_SMELLS:
+                compiled = analyzer.smell_patterns[smell_type]['compiled']
+                assert fused_counts[smell_type] == len(compiled.findall(content))
+    
+    def test_overlapping_token_smells_are_all_reported(self, analyzer, tmp_path):
+        """Test that a match for one token-level smell does not hide another's."""
+        from collections import Counter
+        
+        source = tmp_path / 'overlap.py'
+        source.write_text('x = self.a.b.c.d\n' * 4 + 'y = self._a.b.c\n' * 3 + 'z = self.a.b.12\n' * 5)
+        
+        reported = Counter(smell.type for smell in analyzer._analyze_file_smells(source))
+        
+        assert reported['feature_envy'] == 5
+        assert reported['message_chains'] == 4
+        assert reported['inappropriate_intimacy'] == 3
+        assert reported['magic_numbers'] == 5
+    
     def test_smell_pattern_thresholds(self, analyzer):
         """Test that smell patterns have reasonable thresholds."""
         long_method_threshold = analyzer.smell_patterns['long_method']['threshold']
@@ -1,6 +1,7 @@
 """Tests for Documentation Analyzer."""
 
 import pytest
+import os
 import re
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
@@ -278,6 +279,70 @@ function processData(data) {
         quality = analyzer._analyze_doc_file_quality(test_file)
         assert quality == 0.0
     
+    def test_analyze_doc_file_quality_header_bonus(self, analyzer):
+        """Test that the structure bonus needs three header lines, not three '#' characters."""
+        body = 'Some descriptive text for the project goes here.\n' * 3
+        with patch('builtins.open', mock_open(read_data='# A\n## B\n' + body)):
+            two_headers = analyzer._analyze_doc_file_quality(Path('README.md'))
+        with patch('builtins.open', mock_open(read_data='# A\n## B\n  ### C\n' + body)):
+            three_headers = analyzer._analyze_doc_file_quality(Path('README.md'))
+        with patch('builtins.open', mock_open(read_data='# A\nC# and F# code\n' + body)):
+            hashes_in_text = analyzer._analyze_doc_file_quality(Path('README.md'))
+
+        assert three_headers == pytest.approx(two_headers + 0.1)
+        assert hashes_in_text == two_headers
+
+    def test_analyze_doc_file_quality_binary_and_huge_files(self, analyzer, tmp_path):
+        """Test that binary files score zero and huge files are scored on their head."""
+        from repo_health_analyzer.core.analyzers import documentation_analyzer
+
+        binary = tmp_path / 'LICENSE'
+        binary.write_bytes(b'\x7fELF\x00\x00' + b'MIT License\n' * 20)
+        assert analyzer._analyze_doc_file_quality(binary) == 0.0
+
+        head = '# Project\n\n' + 'Plain text line.\n' * (documentation_analyzer._DOC_HEAD_CHARS // 17)
+        huge = tmp_path / 'README.md'
+        huge.write_text(head + 'See https://example.com\n' * 50000)
+        head_only = tmp_path / 'HEAD.md'
+        head_only.write_text(huge.read_text()[:documentation_analyzer._DOC_HEAD_CHARS])
+
+        assert huge.stat().st_size > documentation_analyzer._DOC_FULL_READ_BYTES
+        assert analyzer._analyze_doc_file_quality(huge) == analyzer._analyze_doc_file_quality(head_only)
+
+    def test_read_text_encodings(self, analyzer, tmp_path):
+        """Test BOM handling and the Latin-1 fallback for non-UTF-8 files."""
+        bom = tmp_path / 'bom.py'
+        bom.write_bytes(b'\xef\xbb\xbf# caf\xc3\xa9\n')
+        latin = tmp_path / 'latin.py'
+        latin.write_bytes(b'# caf\xe9\n')
+
+        assert analyzer._read_text(bom) == '# café\n'
+        assert analyzer._read_text(latin) == '# café\n'
+        assert analyzer._read_text(latin, 3) == '# c'
+        assert analyzer._analyze_file_documentation(latin)['comment_lines'] == 1
+
+    def test_large_files_read_through_mmap(self, analyzer, tmp_path):
+        """Test memory-mapped reads give the same results as the normal read path."""
+        from repo_health_analyzer.core.analyzers import documentation_analyzer as module
+
+        source = tmp_path / 'big.py'
+        cases = [
+            (b'\xef\xbb\xbf' + b'# caf\xc3\xa9\n\ndef f():\n    pass\n\n    # x\n' * 3, 6),
+            # Latin-1 keeps the BOM bytes, so the first comment is not recognised
+            (b'\xef\xbb\xbf' + b'# caf\xe9\n\ndef f():\n    pass\n\n    # x\n' * 3, 5),
+            (b'# caf\xe9\r\ndef f():\r    pass\r\n\r\n    # x\r\n' * 3, 6),
+        ]
+        for body, comment_lines in cases:
+            source.write_bytes(body)
+            normal = DocumentationAnalyzer(analyzer.config)._analyze_file_documentation(source)
+            mapping = DocumentationAnalyzer(analyzer.config)
+            with patch.object(module, '_MMAP_MIN_BYTES', 0), \
+                    patch.object(mapping, '_read_text', side_effect=AssertionError):
+                mapped = mapping._analyze_file_documentation(source)
+
+            assert mapped == normal
+            assert mapped['comment_lines'] == comment_lines
+
     def test_is_comment_line(self, analyzer):
         """Test comment line detection."""
         # Python comments
@@ -306,7 +371,7 @@ function processData(data) {
         func_match = re.search(r'def\s+(\w+)\s*\(', documented_func)
         doc_patterns = analyzer.doc_patterns['python']
         
-        is_documented = analyzer._is_function_documented(documented_func, func_match, doc_patterns, 'python')
+        is_documented = analyzer._is_function_documented(documented_func, func_match, 'python')
         assert is_documented == True
         
         # Function without docstring
@@ -314,8 +379,18 @@ function processData(data) {
     pass'''
         
         func_match = re.search(r'def\s+(\w+)\s*\(', undocumented_func)
-        is_documented = analyzer._is_function_documented(undocumented_func, func_match, doc_patterns, 'python')
+        is_documented = analyzer._is_function_documented(undocumented_func, func_match, 'python')
         assert is_documented == False
+        
+        # Single-quoted docstrings count as documentation too
+        single_quoted_func = """def test_func():
+    '''This function has a docstring.'''
+    pass"""
+        
+        func_match = re.search(r'def\s+(\w+)\s*\(', single_quoted_func)
+        is_documented = analyzer._is_function_documented(single_quoted_func, func_match, 'python')
+        assert is_documented == True
+        assert re.search(doc_patterns['function_docstring'], single_quoted_func, re.DOTALL)
     
     def test_is_class_documented_python(self, analyzer):
         """Test Python class documentation detection."""
@@ -327,9 +402,8 @@ function processData(data) {
     pass'''
         
         class_match = re.search(r'class\s+(\w+)', documented_class)
-        doc_patterns = analyzer.doc_patterns['python']
         
-        is_documented = analyzer._is_class_documented(documented_class, class_match, doc_patterns, 'python')
+        is_documented = analyzer._is_class_documented(documented_class, class_match, 'python')
         assert is_documented == True
         
         # Class without docstring
@@ -337,7 +411,7 @@ function processData(data) {
     pass'''
         
         class_match = re.search(r'class\s+(\w+)', undocumented_class)
-        is_documented = analyzer._is_class_documented(undocumented_class, class_match, doc_patterns, 'python')
+        is_documented = analyzer._is_class_documented(undocumented_class, class_match, 'python')
         assert is_documented == False
     
     @patch('builtins.open', mock_open())
@@ -358,6 +432,66 @@ function processData(data) {
             assert result['has_module_doc'] == True
             assert len(result['undocumented_items']) > 0  # Should find undocumented items
     
+    def test_analyze_file_documentation_line_counts(self, analyzer):
+        """Test non-empty, comment and undocumented item line numbers."""
+        content = 'x = 1\n\n# Helpers\nclass Plain:\n    pass\ndef add(a, b):\n    return a + b\n'
+        with patch('builtins.open', mock_open(read_data=content)):
+            result = analyzer._analyze_file_documentation(Path('test.py'))
+        
+        assert result['total_lines'] == 6
+        assert result['comment_lines'] == 1
+        assert [(item['name'], item['line']) for item in result['undocumented_items']] == [
+            ('add', 6), ('Plain', 4)
+        ]
+    
+    def test_count_lines_vectorized_matches_string_path(self, analyzer, sample_python_documented_code,
+                                                        sample_javascript_documented_code):
+        """Test that NumPy line classification agrees with the per-line string checks."""
+        from repo_health_analyzer.core.analyzers import documentation_analyzer
+
+        extra = '\n \n\t  \r\n # spaced\n  /* block */\n//x\n*\n#'
+        for content in (sample_python_documented_code + extra, sample_javascript_documented_code + extra):
+            for language in ('python', 'javascript', 'generic'):
+                expected = analyzer._count_lines(content, language)
+                with patch.object(documentation_analyzer, '_VECTORIZE_MIN_CHARS', 0):
+                    assert analyzer._count_lines(content, language) == expected
+
+    def test_find_definitions_single_scan(self, analyzer):
+        """Test that one Python scan separates functions, async functions and classes."""
+        content = 'class A:\n    def f(self):\n        pass\n\nasync def g():\n    pass\n'
+        patterns = analyzer._compiled_language_patterns['python']
+        functions, classes = analyzer._find_definitions(content, patterns)
+
+        assert [match['function'] for match in functions] == ['f', 'g']
+        assert [match['class'] for match in classes] == ['A']
+
+    def test_definition_scans_skipped_without_keywords(self, analyzer):
+        """Test that files with no definition keyword are not scanned for definitions."""
+        content = '# Settings\nDEBUG = True\nNAMES = [1, 2]\n'
+        with patch('builtins.open', mock_open(read_data=content)), \
+                patch.object(analyzer, '_find_definitions', side_effect=AssertionError):
+            result = analyzer._analyze_file_documentation(Path('settings.py'))
+
+        assert result['function_count'] == 0
+        assert result['comment_lines'] == 1
+
+    def test_definitions_do_not_span_blank_lines(self, analyzer):
+        """Test that definitions after blank lines report their own line."""
+        content = "'''Unclosed module string\n\n\n\ndef add(a, b):\n    return a + b\n"
+        with patch('builtins.open', mock_open(read_data=content)):
+            result = analyzer._analyze_file_documentation(Path('test.py'))
+
+        assert result['has_module_doc'] is False
+        assert [(item['name'], item['line']) for item in result['undocumented_items']] == [('add', 5)]
+
+    def test_has_triple_quoted_string(self, analyzer):
+        """Test closed triple-quoted string detection."""
+        assert analyzer._has_triple_quoted_string('"""Doc."""')
+        assert analyzer._has_triple_quoted_string("x = 1\n'''Doc\nmore'''")
+        assert analyzer._has_triple_quoted_string('""""""')
+        assert not analyzer._has_triple_quoted_string('""""')
+        assert not analyzer._has_triple_quoted_string('"""Doc.\'\'\'')
+
     @patch('builtins.open', mock_open())
     def test_analyze_file_documentation_javascript(self, analyzer, sample_javascript_documented_code):
         """Test JavaScript file documentation analysis."""
@@ -408,42 +542,99 @@ function processData(data) {
             assert result['documented_classes'] > 0
             assert 0 <= result['comment_density'] <= 1
     
-    def test_analyze_documentation_files(self, analyzer, sample_readme_content):
+    def test_undocumented_items_capped(self, analyzer, tmp_path):
+        """Test that undocumented items are capped for reporting but all counted."""
+        from repo_health_analyzer.core.analyzers import documentation_analyzer
+
+        source = tmp_path / 'many.py'
+        source.write_text(''.join(f'def f{i}():\n    pass\n' for i in range(7)))
+
+        with patch.object(documentation_analyzer, '_MAX_UNDOCUMENTED_ITEMS', 5):
+            file_analysis = analyzer._analyze_file_documentation(source)
+            result = analyzer._analyze_code_documentation([source, source])
+
+        assert file_analysis['total_undocumented'] == 7
+        assert [item['line'] for item in file_analysis['undocumented_items']] == [1, 3, 5, 7, 9]
+        assert result['total_undocumented'] == 14
+        assert len(result['undocumented_items']) == 5
+
+    def test_analyze_code_documentation_covers_every_file(self, analyzer, tmp_path,
+                                                         sample_python_documented_code):
+        """Test that every source file is analyzed, not just the first few."""
+        files = []
+        for i in range(8):
+            file_path = tmp_path / f'module_{i}.py'
+            file_path.write_text(sample_python_documented_code * (i % 3 + 1))
+            files.append(file_path)
+
+        result = analyzer._analyze_code_documentation(files)
+
+        assert result['total_modules'] == len(files)
+        assert result['total_functions'] == sum(
+            analyzer._analyze_file_documentation(file_path)['function_count'] for file_path in files
+        )
+
+    def test_analyze_documentation_files(self, analyzer, sample_readme_content, tmp_path):
         """Test documentation files analysis."""
-        # Mock file system with README.md
-        def mock_rglob(self, pattern):
-            if pattern == '*':
-                return [Path('README.md'), Path('src/main.py')]
-            return []
-        
-        with patch('builtins.open', mock_open(read_data=sample_readme_content)):
-            with patch.object(Path, 'rglob', mock_rglob):
-                with patch.object(Path, 'is_file', return_value=True):
-                    repo_path = Path('/fake/repo')
-                    result = analyzer._analyze_documentation_files(repo_path)
-                    
-                    assert 'files_found' in result
-                    assert 'total_score' in result
-                    assert 'max_possible_score' in result
-                    assert 'file_qualities' in result
-                    assert 'missing_docs' in result
-                    
-                    assert result['total_score'] > 0
-                    assert result['max_possible_score'] > 0
-                    assert 'readme_files' in result['files_found']
+        (tmp_path / 'README.md').write_text(sample_readme_content)
+        (tmp_path / 'src').mkdir()
+        (tmp_path / 'src' / 'main.py').write_text('print("hi")\n')
+        
+        result = analyzer._analyze_documentation_files(tmp_path)
+        
+        assert 'files_found' in result
+        assert 'total_score' in result
+        assert 'max_possible_score' in result
+        assert 'missing_docs' in result
+        
+        assert result['total_score'] > 0
+        assert result['max_possible_score'] > 0
+        [(readme, quality)] = result['files_found']['readme_files']
+        assert readme == tmp_path / 'README.md'
+        assert quality == analyzer._analyze_doc_file_quality(readme)
+    
+    def test_find_documentation_files(self, analyzer, tmp_path):
+        """Test that one walk groups doc files by type and skips tooling directories."""
+        (tmp_path / 'README.md').write_text('# Project')
+        (tmp_path / 'CHANGES.rst').write_text('1.0')
+        (tmp_path / 'LICENSE').write_text('MIT')
+        (tmp_path / '.github').mkdir()
+        (tmp_path / '.github' / 'CONTRIBUTING.md').write_text('Send PRs')
+        (tmp_path / 'node_modules' / 'pkg').mkdir(parents=True)
+        (tmp_path / 'node_modules' / 'pkg' / 'README.md').write_text('# Dependency')
+        # Only regular files count, as with Path.is_file(): not broken links or FIFOs
+        (tmp_path / 'CHANGELOG.md').symlink_to(tmp_path / 'missing.md')
+        (tmp_path / 'docs').mkdir()
+        if hasattr(os, 'mkfifo'):
+            os.mkfifo(tmp_path / 'docs' / 'README.md')
+        
+        files_by_type = analyzer._find_documentation_files(tmp_path)
+        
+        assert files_by_type == {
+            'readme_files': [tmp_path / 'README.md'],
+            'changelog_files': [tmp_path / 'CHANGES.rst'],
+            'license_files': [tmp_path / 'LICENSE'],
+            'contributing_files': [tmp_path / '.github' / 'CONTRIBUTING.md'],
+        }
     
+    def test_expand_name_pattern(self, analyzer):
+        """Test expansion of literal file name patterns into suffixes."""
+        assert analyzer._expand_name_pattern(r'README\.(md|rst)$') == ('readme.md', 'readme.rst')
+        assert analyzer._expand_name_pattern(r'LICENSE(\.txt)?$') == ('license.txt', 'license')
+        assert analyzer._expand_name_pattern(r'docs?/.*\.(md|rst|txt)$') is None
+        assert analyzer._expand_name_pattern(r'README\.md') is None
+
+        assert 'api_docs' in dict(analyzer._doc_name_regexes)
+        assert 'changes.rst' in analyzer._doc_name_suffixes['changelog_files']
+
     def test_calculate_documentation_metrics(self, analyzer):
         """Test documentation metrics calculation."""
         doc_files_analysis = {
             'total_score': 8.0,
             'max_possible_score': 10.0,
             'files_found': {
-                'readme_files': [Path('README.md')],
-                'changelog_files': [Path('CHANGELOG.md')]
-            },
-            'file_qualities': {
-                'README.md': 0.8,
-                'CHANGELOG.md': 0.6
+                'readme_files': [(Path('README.md'), 0.8)],
+                'changelog_files': [(Path('CHANGELOG.md'), 0.6)]
             }
         }
         
@@ -474,58 +665,44 @@ function processData(data) {
         assert 0 <= metrics['readme_quality'] <= 10
         assert 0 <= metrics['docstring_coverage'] <= 1
         assert 0 <= metrics['api_doc_coverage'] <= 1
+        assert metrics['readme_quality'] == pytest.approx(8.0)
+        assert metrics['doc_files_count'] == 2
         assert metrics['has_changelog'] == True
         assert metrics['doc_files_count'] == 2
     
-    @patch('builtins.open', mock_open())
-    def test_analyze_integration(self, analyzer, sample_readme_content, sample_python_documented_code):
+    def test_analyze_integration(self, analyzer, sample_readme_content, sample_python_documented_code,
+                                 tmp_path):
         """Test full analysis integration."""
-        def mock_rglob(self, pattern):
-            if pattern == '*':
-                return [Path('README.md'), Path('src/main.py')]
-            return []
-        
-        with patch('builtins.open', mock_open(read_data=sample_readme_content)):
-            with patch.object(Path, 'rglob', mock_rglob):
-                with patch.object(Path, 'is_file', return_value=True):
-                    repo_path = Path('/fake/repo')
-                    source_files = [Path('test1.py'), Path('test2.py')]
-                    
-                    # Mock the file content based on the file being opened
-                    def side_effect(*args, **kwargs):
-                        if 'README.md' in str(args[0]):
-                            return mock_open(read_data=sample_readme_content)(*args, **kwargs)
-                        else:
-                            return mock_open(read_data=sample_python_documented_code)(*args, **kwargs)
-                    
-                    with patch('builtins.open', side_effect=side_effect):
-                        result = analyzer.analyze(repo_path, source_files)
-                        
-                        assert result is not None
-                        assert hasattr(result, 'score')
-                        assert hasattr(result, 'readme_quality')
-                        assert hasattr(result, 'docstring_coverage')
-                        assert hasattr(result, 'api_doc_coverage')
-                        assert hasattr(result, 'has_changelog')
-                        assert hasattr(result, 'has_contributing_guide')
-                        assert hasattr(result, 'doc_files_count')
-                        
-                        assert 0 <= result.score <= 10
-                        assert 0 <= result.readme_quality <= 10
-                        assert 0 <= result.docstring_coverage <= 1
-    
-    def test_empty_source_files(self, analyzer):
+        (tmp_path / 'README.md').write_text(sample_readme_content)
+        source_files = []
+        for name in ('test1.py', 'test2.py'):
+            source_file = tmp_path / name
+            source_file.write_text(sample_python_documented_code)
+            source_files.append(source_file)
+        
+        result = analyzer.analyze(tmp_path, source_files)
+        
+        assert result is not None
+        assert hasattr(result, 'score')
+        assert hasattr(result, 'readme_quality')
+        assert hasattr(result, 'docstring_coverage')
+        assert hasattr(result, 'api_doc_coverage')
+        assert hasattr(result, 'has_changelog')
+        assert hasattr(result, 'has_contributing_guide')
+        assert hasattr(result, 'doc_files_count')
+        
+        assert 0 <= result.score <= 10
+        assert 0 < result.readme_quality <= 10
+        assert 0 <= result.docstring_coverage <= 1
+        assert result.doc_files_count == 1
+    
+    def test_empty_source_files(self, analyzer, tmp_path):
         """Test analysis with empty source files."""
-        def mock_rglob(self, pattern):
-            return []
+        source_files = []
+        result = analyzer.analyze(tmp_path, source_files)
         
-        with patch.object(Path, 'rglob', mock_rglob):
-            repo_path = Path('/fake/repo')
-            source_files = []
-            result = analyzer.analyze(repo_path, source_files)
-            
-            assert result is not None
-            assert result.score >= 0
+        assert result is not None
+        assert result.score >= 0
     
     def test_doc_file_pattern_matching(self, analyzer):
         """Test documentation file pattern matching."""
@@ -545,6 +722,18 @@ function processData(data) {
         contrib_patterns = patterns['contributing_files']['patterns']
         assert any(re.search(pattern, 'CONTRIBUTING.md') for pattern in contrib_patterns)
     
+    def test_patterns_precompiled(self, analyzer):
+        """Test that pattern tables are compiled once with their search flags."""
+        for config in analyzer.doc_file_patterns.values():
+            assert config['compiled'].flags & re.IGNORECASE
+            for pattern in config['patterns']:
+                assert f'(?:{pattern})' in config['compiled'].pattern
+
+        for language, patterns in analyzer.language_patterns.items():
+            compiled = analyzer._compiled_language_patterns[language]
+            assert {name: p.pattern for name, p in compiled.items()} == patterns
+            assert all(p.flags & re.MULTILINE for p in compiled.values())
+
     def test_quality_indicators_detection(self, analyzer, sample_readme_content):
         """Test quality indicators in documentation."""
         quality = analyzer._analyze_doc_file_quality(Path('fake'))
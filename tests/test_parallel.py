@@ -0,0 +1,71 @@
+"""Tests for the shared per-file process pool helper."""
+
+import pickle
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from repo_health_analyzer.core.analyzers import parallel
+from repo_health_analyzer.core.analyzers.parallel import map_files
+from repo_health_analyzer.core.analyzers.code_smell_analyzer import CodeSmellAnalyzer
+from repo_health_analyzer.core.analyzers.documentation_analyzer import DocumentationAnalyzer
+from repo_health_analyzer.core.analyzers import test_analyzer
+from repo_health_analyzer.models.simple_report import AnalysisConfig
+
+
+def _line_count(file_path: Path) -> int:
+    """Count the lines of a file; module level so worker processes can load it."""
+    return len(file_path.read_text().splitlines())
+
+
+class TestMapFiles:
+    """Test cases for map_files."""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        """Create enough files of differing lengths to use the process pool."""
+        files = []
+        for i in range(parallel._PARALLEL_MIN_FILES + 8):
+            file_path = tmp_path / f'module_{i}.py'
+            file_path.write_text('x = 1\n' * (i % 5 + 1))
+            files.append(file_path)
+        return files
+
+    def test_pool_results_match_serial_in_order(self, files):
+        """Test that the process pool yields the serial results, in input order."""
+        expected = [i % 5 + 1 for i in range(len(files))]
+
+        assert list(map_files(_line_count, files)) == expected
+        with patch.object(parallel, '_PARALLEL_MIN_FILES', len(files) + 1):
+            assert list(map_files(_line_count, files)) == expected
+
+    def test_small_inputs_run_without_a_pool(self, files):
+        """Test that inputs below the threshold never start worker processes."""
+        small = files[:parallel._PARALLEL_MIN_FILES - 1]
+
+        with patch.object(parallel, 'ProcessPoolExecutor') as executor:
+            assert list(map_files(_line_count, small)) == [_line_count(f) for f in small]
+
+        executor.assert_not_called()
+
+    def test_large_inputs_use_the_pool_with_chunksize(self, files):
+        """Test that inputs at the threshold go to the pool in chunks of the given size."""
+        with patch.object(parallel, 'ProcessPoolExecutor') as executor:
+            pool = executor.return_value.__enter__.return_value
+            pool.map.return_value = iter(range(len(files)))
+
+            assert list(map_files(_line_count, files, chunksize=32)) == list(range(len(files)))
+
+        pool.map.assert_called_once_with(_line_count, files, chunksize=32)
+
+    @pytest.mark.parametrize('analyzer_class, method_name', [
+        (CodeSmellAnalyzer, '_analyze_file_smells_safe'),
+        (DocumentationAnalyzer, '_analyze_file_documentation_safe'),
+        (test_analyzer.TestCodeAnalyzer, '_scan_test_file'),
+    ])
+    def test_analyzer_file_methods_pickle(self, analyzer_class, method_name, files):
+        """Test that each analyzer's per-file method can be sent to worker processes."""
+        method = getattr(analyzer_class(AnalysisConfig()), method_name)
+
+        restored = pickle.loads(pickle.dumps(method))
+
+        assert restored(files[0]) == method(files[0])
@@ -1,6 +1,7 @@
 """Tests for Sustainability Analyzer."""
 
 import pytest
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -119,6 +120,12 @@ class TestSustainabilityAnalyzer:
         assert 'active_development' in health
         assert 'community_engagement' in health
         assert 'release_management' in health
+        
+        # Compiled patterns mirror the raw pattern groups, minus the (?i) flag
+        for group, group_patterns in patterns.items():
+            compiled = analyzer._compiled_patterns[group]
+            assert {category: '(?i)' + pattern.pattern for category, pattern in compiled.items()} == group_patterns
+            assert not any(pattern.flags & re.IGNORECASE for pattern in compiled.values())
     
     def test_parse_date_formats(self, analyzer):
         """Test date parsing with different formats."""
@@ -162,6 +169,9 @@ class TestSustainabilityAnalyzer:
         assert result['total_commits'] == len(sample_commit_history)
         assert result['recent_commits_30d'] >= 0
         assert result['recent_commits_90d'] >= result['recent_commits_30d']
+        
+        # Commits exactly on a window's edge fall just outside it
+        assert (result['recent_commits_30d'], result['recent_commits_90d'], result['recent_commits_1y']) == (4, 7, 10)
         assert result['activity_trend'] in ['increasing', 'decreasing', 'stable', 'insufficient_data', 'new_project']
     
     def test_analyze_activity_patterns_empty(self, analyzer):
@@ -254,6 +264,9 @@ class TestSustainabilityAnalyzer:
         # Security fix should be detected
         assert maintenance['security_fixes'] > 0
         
+        # Release commits are counted in the same pass for the health indicators
+        assert result['release_commits'] == 2  # 'Release version 2.1.0' and '... latest versions'
+        
         # Check ratios are valid
         assert 0 <= result['maintenance_ratio'] <= 1
         assert 0 <= result['health_ratio'] <= 1
@@ -284,6 +297,40 @@ class TestSustainabilityAnalyzer:
         assert 0 <= result['recency_health'] <= 10
         assert 0 <= result['release_health'] <= 10
     
+    def test_commit_dates_parsed_once(self, analyzer, sample_commit_history, sample_repo_info):
+        """Test that analyze parses each commit date once for all sub-analyses."""
+        with patch.object(analyzer, '_parse_date', wraps=analyzer._parse_date) as parse_date:
+            analyzer.analyze(sample_commit_history, sample_repo_info, [])
+        
+        assert parse_date.call_count == len(sample_commit_history)
+    
+    def test_analysis_uses_one_clock_reading(self, analyzer, sample_commit_history, sample_repo_info):
+        """Test that every time window in one analysis is measured from the same instant."""
+        from repo_health_analyzer.core.analyzers import sustainability_analyzer as module
+        
+        readings = []
+        
+        class RecordingDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                readings.append(datetime.now(tz))
+                return readings[-1]
+        
+        with patch.object(module, 'datetime', RecordingDatetime):
+            analyzer.analyze(sample_commit_history, sample_repo_info, [])
+        
+        assert len(readings) == 1
+    
+    def test_health_indicators_skip_non_string_dates(self, analyzer, sample_commit_history, sample_repo_info):
+        """Test that a malformed date does not discard the other commits' dates."""
+        history = sample_commit_history + [{'author': 'Bot', 'date': 12345, 'message': 'Automated'}]
+        
+        result = analyzer._analyze_health_indicators(history, sample_repo_info)
+        expected = analyzer._analyze_health_indicators(sample_commit_history, sample_repo_info)
+        
+        assert result['project_age_days'] == expected['project_age_days'] > 0
+        assert result['days_since_last_commit'] == expected['days_since_last_commit']
+    
     def test_calculate_sustainability_metrics(self, analyzer):
         """Test sustainability metrics calculation."""
         activity_analysis = {
@@ -445,6 +492,38 @@ class TestSustainabilityAnalyzer:
         assert maintenance['test_improvements'] > 0
         assert maintenance['ci_cd_updates'] > 0
     
+    def test_compiled_patterns_shared_between_instances(self, analyzer):
+        """Test that analyzers reuse the patterns compiled at import instead of compiling their own."""
+        with patch.object(SustainabilityAnalyzer, '_compile_sustainability_patterns') as compile_patterns:
+            other = SustainabilityAnalyzer(AnalysisConfig())
+        
+        compile_patterns.assert_not_called()
+        assert other.sustainability_patterns is analyzer.sustainability_patterns
+        assert other._compiled_patterns is analyzer._compiled_patterns
+        assert other._indicator_checks is analyzer._indicator_checks
+    
+    def test_keyword_alternations_use_substring_checks(self, analyzer):
+        """Test that only plain word alternations are turned into keyword checks."""
+        checks = {category: keywords for group in analyzer._indicator_checks.values()
+                  for category, keywords, _ in group}
+        
+        assert checks['bug_fixes'] == ('fix', 'bug', 'issue', 'error', 'problem')
+        assert checks['dependency_updates'] is None
+        assert checks['community_engagement'] is None
+    
+    def test_maintenance_patterns_match_any_case(self, analyzer):
+        """Test that lower-cased matching still finds upper-case and caseless-equivalent keywords."""
+        commits = [
+            {'message': 'SECURITY PATCH', 'author': 'dev'},
+            {'message': 'Fıx flaky ſpec', 'author': 'dev'},
+        ]
+        
+        maintenance = analyzer._analyze_maintenance_patterns(commits, [])['maintenance_indicators']
+        
+        assert maintenance['security_fixes'] == 2
+        assert maintenance['bug_fixes'] == 1
+        assert maintenance['test_improvements'] == 1
+    
     def test_date_parsing_edge_cases(self, analyzer):
         """Test date parsing with edge cases."""
         # Date with timezone
@@ -462,6 +541,14 @@ class TestSustainabilityAnalyzer:
         # None input
         date4 = analyzer._parse_date(None)
         assert date4 is None
+        
+        # Layouts outside the three formats are still rejected
+        assert analyzer._parse_date('2024-01-15T10:30:00.123456') is None
+        assert analyzer._parse_date('2024-01-15 10:30') is None
+        assert analyzer._parse_date('2024-1-5') == datetime(2024, 1, 5)
+        assert analyzer._parse_date('2024-1-5 9:05:00') == datetime(2024, 1, 5, 9, 5)
+        assert analyzer._parse_date('2024-1-5t9:05:00') == datetime(2024, 1, 5, 9, 5)
+        assert analyzer._parse_date('2024-01-15T10:30:00+05:00') == datetime(2024, 1, 15, 10, 30)
     
     def test_contributor_activity_timeline(self, analyzer, sample_commit_history):
         """Test contributor activity timeline tracking."""
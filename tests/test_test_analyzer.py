@@ -354,6 +354,97 @@ class UserTest {
         assert 'javascript' in patterns['file_patterns']
         assert 'java' in patterns['file_patterns']
     
+    def test_compiled_patterns(self, analyzer):
+        """Test patterns are compiled once, with their match categories."""
+        assert analyzer._test_file_pattern.search('tests/conftest.py')
+        assert analyzer._test_file_pattern.search('src/app/user_test.py')
+        assert not analyzer._test_file_pattern.search('src/app/user.py')
+        
+        categories = dict(
+            (pattern.pattern, category)
+            for category, _, pattern in analyzer._compiled_function_patterns['python']
+        )
+        assert categories[r'^\s*class\s+Test\w+\s*[\(:]'] == 'test_classes'
+        assert categories[r'^\s*@pytest\.fixture'] == 'setup_teardown'
+        assert categories[r'^\s*def\s+test_\w+\s*\('] == 'test_functions'
+        
+        frameworks = dict(analyzer._compiled_framework_patterns['python'])
+        assert [pattern.pattern for pattern in frameworks['unittest']] == [
+            r'import\s+unittest', r'from\s+unittest', r'unittest\.testcase'
+        ]
+
+    def test_compiled_patterns_shared_between_instances(self, analyzer):
+        """Test that analyzers reuse the patterns compiled at import instead of compiling their own."""
+        with patch.object(TestCodeAnalyzer, '_compile_test_patterns') as compile_patterns:
+            other = TestCodeAnalyzer(analyzer.config)
+
+        compile_patterns.assert_not_called()
+        assert other.test_patterns is analyzer.test_patterns
+        assert other._test_file_pattern is analyzer._test_file_pattern
+        assert other._compiled_function_patterns is analyzer._compiled_function_patterns
+        assert other._compiled_framework_patterns is analyzer._compiled_framework_patterns
+
+    def test_expand_file_pattern(self, analyzer):
+        """Test file patterns are expanded into literal string checks."""
+        assert analyzer._expand_file_pattern(r'.*_test\.py$') == [(False, ('_test.py',))]
+        assert analyzer._expand_file_pattern(r'test_.*\.py$') == [(False, ('test_', '.py'))]
+        assert analyzer._expand_file_pattern(r'^tests?/.*\.js$') == [
+            (True, ('tests/', '.js')), (True, ('test/', '.js'))
+        ]
+        assert analyzer._expand_file_pattern(r'^$') == [(True, ('',))]
+        assert analyzer._expand_file_pattern(r'test_\d+\.py$') is None
+        assert analyzer._expand_file_pattern(r'test_.*\.py') is None
+        
+        assert '_test.py' in analyzer._test_file_suffixes
+        assert analyzer._residual_file_pattern is None
+    
+    def test_is_test_file_path(self, analyzer):
+        """Test the string checks agree with the file patterns."""
+        paths = [
+            'test_user.py', 'src/user_test.py', 'pkg/tests/helpers.py', 'test/a.py', 'xtest/a.py',
+            'tests/a.js', '__tests__/a.js', 'src/__tests__/a.js', 'a.spec.ts', 'src/test_.py',
+            'test_a.pyc', 'src/user.py', 'usertest.java', 'a/test/b.cs', 'test_a.py\n', 'test_a\n.py'
+        ]
+        for path in paths:
+            assert analyzer._is_test_file_path(path) == bool(analyzer._test_file_pattern.search(path)), path
+    
+    def test_required_literal(self, analyzer):
+        """Test the text a pattern's matches must contain."""
+        assert analyzer._required_literal(r'^\s*@pytest\.fixture') == '@pytest.fixture'
+        assert analyzer._required_literal(r'^\s*def\s+test_\w+\s*\(') == 'def'
+        assert analyzer._required_literal(r'chai\.expect\(') == 'chai.expect('
+        assert analyzer._required_literal(r'expect\s*\(') == 'expect'
+        assert analyzer._required_literal(r'tests?/') == 'test'
+        assert analyzer._required_literal(r'^\s*(?:it|test)\s*\(') == ''
+        assert analyzer._required_literal(r'import\s+nose|from\s+nose') == ''
+    
+    def test_patterns_skipped_without_literal(self, analyzer):
+        """Test files without a pattern's literal text get the same counts."""
+        content = "import unittest\n\nclass TestA(unittest.TestCase):\n    def test_a(self):\n        assert True\n"
+        with patch('builtins.open', mock_open(read_data=content)):
+            result = analyzer._analyze_single_test_file(Path('test_a.py'))
+        
+        assert result['test_classes'] == 1
+        assert result['test_functions'] == 1
+        assert result['setup_teardown'] == 0
+        assert result['assertions'] == 1
+    
+    def test_top_level_alternatives(self, analyzer):
+        """Test patterns are split only at top-level alternations."""
+        assert analyzer._top_level_alternatives(r'import\s+nose|from\s+nose') == [r'import\s+nose', r'from\s+nose']
+        assert analyzer._top_level_alternatives(r'def\s+(setUp|tearDown)') == [r'def\s+(setUp|tearDown)']
+        assert analyzer._top_level_alternatives(r'[|]a|\|b') == ['[|]a', r'\|b']
+        assert analyzer._top_level_alternatives(r'(?i)a|b') == ['(?i)a|b']
+    
+    def test_framework_detection_ignores_case(self, analyzer):
+        """Test lower-cased framework matching agrees with case-insensitive matching."""
+        assert analyzer._lower_case_literals(r'@Test\S\W') == r'@test\S\W'
+        
+        detected = analyzer._detect_file_frameworks(Path('test_a.py'), 'IMPORT PYTEST\nclass A(UNİTTEST.TestCaſe): pass')
+        assert detected == ['pytest', 'unittest']
+        assert analyzer._detect_file_frameworks(Path('ATest.java'), '@TEST void a() {}') == ['junit']
+        assert analyzer._detect_file_frameworks(Path('test_a.rb'), 'describe(') == []
+    
     def test_detect_language(self, analyzer):
         """Test language detection."""
         assert analyzer._detect_language('.py') == 'python'
@@ -444,6 +535,14 @@ class UserTest {
         result = analyzer._analyze_single_test_file(test_file)
         assert result is None
     
+    def test_analyze_single_test_file_counts_non_blank_lines(self, analyzer):
+        """Test lines holding only whitespace are not counted."""
+        content = "import pytest\n\n   \n\t\x0c\n\u00a0\ndef test_a():\n    assert True\n"
+        result = analyzer._analyze_single_test_file(Path('test_a.py'), content)
+        
+        assert result['total_lines'] == 3
+        assert result['assertion_density'] == 1 / 3
+    
     def test_analyze_test_coverage(self, analyzer):
         """Test test coverage analysis."""
         test_files = [
@@ -478,6 +577,49 @@ class UserTest {
         # Coverage should be reasonable
         assert 0 <= result['estimated_coverage_percentage'] <= 1
     
+    def test_coverage_config_found_in_parent_directories(self, analyzer, tmp_path):
+        """Test coverage configuration is looked up in every parent directory."""
+        (tmp_path / 'jest.config.js').write_text('module.exports = {}')
+        project = tmp_path / 'project'
+        (project / 'tests').mkdir(parents=True)
+        (project / '.coveragerc').write_text('[run]')
+        (project / 'coverage.cfg').symlink_to(tmp_path / 'missing.cfg')
+        
+        result = analyzer._analyze_test_coverage([project / 'tests' / 'test_a.py'], [])
+        
+        assert result['has_coverage_config']
+        assert result['coverage_indicators'][:2] == ['.coveragerc', 'jest.config.js']
+        assert analyzer._find_coverage_files(project) == ['.coveragerc']
+        assert analyzer._find_coverage_files(project / 'tests') == []
+        assert analyzer._find_coverage_files(tmp_path / 'missing') == []
+    
+    def test_find_corresponding_tests(self, analyzer):
+        """Test the name index pairs sources with tests in both directions."""
+        test_files = [Path('test_user.py'), Path('user_service_test.py'), Path('test_db.py'), Path('test_user.py')]
+        test_index = analyzer._index_test_names(test_files)
+        
+        assert analyzer._find_corresponding_tests('user', test_index) == [0, 1, 3]  # in a test name
+        assert analyzer._find_corresponding_tests('user_model', test_index) == [0, 3]  # contains a test name
+        assert analyzer._find_corresponding_tests('db_utils', test_index) == [2]
+        assert analyzer._find_corresponding_tests('config', test_index) == []
+        assert analyzer._find_corresponding_tests('', test_index) == [0, 1, 2, 3]
+
+    def test_coverage_matches_each_source_stem_once(self, analyzer):
+        """Test sources sharing a stem are matched once but mapped separately."""
+        test_files = [Path('tests/test_index.py')]
+        source_files = [Path('src/a/index.py'), Path('src/b/index.py'), Path('src/c/main.py')]
+
+        with patch.object(analyzer, '_find_corresponding_tests',
+                          wraps=analyzer._find_corresponding_tests) as find:
+            result = analyzer._analyze_test_coverage(test_files, source_files)
+
+        assert [call.args[0] for call in find.call_args_list] == ['index', 'main']
+        mapping = result['test_to_source_mapping']
+        assert mapping[str(Path('src/a/index.py'))] == [str(Path('tests/test_index.py'))]
+        assert mapping[str(Path('src/b/index.py'))] == [str(Path('tests/test_index.py'))]
+        assert mapping[str(Path('src/a/index.py'))] is not mapping[str(Path('src/b/index.py'))]
+        assert result['potentially_uncovered_files'] == [str(Path('src/c/main.py'))]
+
     @patch('builtins.open', mock_open())
     def test_detect_test_frameworks_python(self, analyzer, sample_python_test_code):
         """Test Python test framework detection."""
@@ -498,6 +640,75 @@ class UserTest {
                 assert framework in result['framework_confidence']
                 assert 0 <= result['framework_confidence'][framework] <= 1
     
+    def test_detect_test_frameworks_from_file_frameworks(self, analyzer):
+        """Test framework detection from per-file results does not reopen files."""
+        test_files = [Path('test_user.py'), Path('test_unreadable.py')]
+        file_frameworks = {Path('test_user.py'): ['pytest']}
+        
+        with patch('builtins.open') as mocked_open:
+            result = analyzer._detect_test_frameworks(test_files, file_frameworks)
+        
+        mocked_open.assert_not_called()
+        assert result['framework_files']['pytest'] == ['test_user.py']
+        assert result['framework_confidence']['pytest'] == 0.5
+    
+    def test_scan_test_file(self, analyzer, sample_python_test_code):
+        """Test one scan yields the file analysis and its frameworks."""
+        with patch('builtins.open', mock_open(read_data=sample_python_test_code)):
+            file_analysis, frameworks = analyzer._scan_test_file(Path('test_user.py'))
+        
+        assert file_analysis == analyzer._analyze_single_test_file(Path('test_user.py'), sample_python_test_code)
+        assert 'pytest' in frameworks
+        
+        with patch('builtins.open', side_effect=IOError("File not found")):
+            assert analyzer._scan_test_file(Path('test_user.py')) == (None, None)
+    
+    def test_scan_skips_languages_without_patterns(self, analyzer):
+        """Test files of languages with no patterns to run are not read."""
+        assert 'csharp' not in analyzer._scanned_languages
+        
+        with patch('builtins.open', mock_open(read_data='[Test] public void A() {}')) as mocked_open:
+            assert analyzer._scan_test_file(Path('UserTests.cs')) == (None, None)
+        
+        mocked_open.assert_not_called()
+    
+    def test_analyze_test_files_keeps_running_totals(self, analyzer, tmp_path):
+        """Test function lengths and densities are aggregated as totals and counts."""
+        short_file = tmp_path / 'test_short.py'
+        short_file.write_text("def test_a():\n    assert True\n")
+        long_file = tmp_path / 'test_long.py'
+        long_file.write_text("def test_b():\n    x = 1\n    assert x\n\ndef test_c():\n    assert x\n")
+        
+        analysis = analyzer._analyze_test_files([short_file, long_file])
+        
+        assert analysis['test_function_length_count'] == 3
+        assert analysis['test_function_length_total'] == 2 + 5
+        assert analysis['assertion_density_count'] == 2
+        assert analysis['assertion_density_total'] == 1 / 2 + 2 / 5
+    
+    def test_calculate_test_metrics_average_test_length(self, analyzer):
+        """Test short average test lengths lower the estimated success rate."""
+        coverage_analysis = {'has_coverage_config': False}
+        framework_analysis = {'detected_frameworks': ['pytest']}
+        test_analysis = {'total_test_functions': 4, 'total_assertions': 12, 'test_classes': 2}
+        
+        baseline = analyzer._calculate_test_metrics(test_analysis, coverage_analysis, framework_analysis, 2, 4)
+        short = analyzer._calculate_test_metrics(
+            dict(test_analysis, test_function_length_total=12.0, test_function_length_count=4),
+            coverage_analysis, framework_analysis, 2, 4
+        )
+        
+        assert short['estimated_success_rate'] == pytest.approx(baseline['estimated_success_rate'] * 0.8)
+    
+    def test_analyze_reads_each_test_file_once(self, analyzer, sample_python_test_code):
+        """Test the full analysis reads every test file a single time."""
+        source_files = [Path('src/user.py'), Path('test_user.py'), Path('test_service.py')]
+        
+        with patch('builtins.open', mock_open(read_data=sample_python_test_code)) as mocked_open:
+            analyzer.analyze(source_files)
+        
+        assert mocked_open.call_count == 2
+    
     @patch('builtins.open', mock_open())
     def test_detect_test_frameworks_javascript(self, analyzer, sample_javascript_test_code):
         """Test JavaScript test framework detection."""